@@ -19,7 +19,8 @@ from routers import reports as reports_router
 from routers.auth import router as auth_router
 from routers import two_factor as two_factor_router
 from routers import organization as organization_router
-from routers import uploads as uploads_router 
+from routers import uploads as uploads_router
+from services.email_service import get_email_service
 
 load_dotenv()
 
@@ -83,10 +84,21 @@ async def lifespan(app_instance: FastAPI):
         print(f"An unexpected error occurred during Firebase/Firestore initialization: {e}")
         traceback.print_exc()
 
+    # Start the background email queue so routers can enqueue sends; skipped
+    # (with direct-send fallback in EmailService) when Mailjet isn't configured.
+    email_service = None
+    try:
+        email_service = get_email_service()
+        await email_service.start()
+    except ValueError as e:
+        print(f"EmailService not configured; email queue not started. ({e})")
 
-    yield 
+    yield
 
     print("FastAPI application shutting down...")
+    if email_service is not None:
+        await email_service.stop()
+        print("Email queue drained and stopped.")
     if hasattr(app_instance.state, 'db') and app_instance.state.db is not None:
         print(f"Attempting to close Firestore client of type: {type(app_instance.state.db)}")
         try:
@@ -106,7 +118,7 @@ app = FastAPI(
     title="Fiji Backend API",
     description="API for managing volunteers, events, and organizational data for Project Fiji.",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
 )
 
 origins_env = os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:3001")
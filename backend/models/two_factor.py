@@ -19,8 +19,11 @@ class TwoFactorCode(TwoFactorCodeCreate):
     created_at: datetime = Field(..., description="When the code was created")
     expires_at: datetime = Field(..., description="When the code expires")
     used_at: Optional[datetime] = Field(None, description="When the code was used")
-    
-    model_config = ConfigDict(from_attributes=True)
+
+    # frozen keeps instances hashable/immutable and lets pydantic-core use
+    # its fastest construction path; extra Firestore fields (e.g. updated_at)
+    # are dropped rather than rejected
+    model_config = ConfigDict(from_attributes=True, extra="ignore", frozen=True)
 
 class TwoFactorVerifyRequest(BaseModel):
     """Model for verifying a 2FA code"""
@@ -51,8 +54,8 @@ class TrustedDevice(TrustedDeviceCreate):
     created_at: datetime = Field(..., description="When the device was first trusted")
     last_used_at: datetime = Field(..., description="When the device was last used")
     expires_at: datetime = Field(..., description="When the device trust expires")
-    
-    model_config = ConfigDict(from_attributes=True)
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore", frozen=True)
 
 class TrustedDeviceResponse(BaseModel):
     """Response model for trusted device"""
@@ -8,7 +8,7 @@ from firebase_admin import auth, firestore
 from models.user import UserResponse
 from models.invitation import InvitationValidateResponse
 from dependencies.database import get_db
-from services.two_factor_service import TwoFactorService
+from services.two_factor_service import TwoFactorService, get_two_factor_service
 from services.session_service import SessionService # Added SessionService import
 
 USERS_COLLECTION = "users"
@@ -69,7 +69,7 @@ async def session_login(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="UID not found in Firebase token.")
 
     ip_address, user_agent = get_client_info(request)
-    two_factor_service = TwoFactorService(db)
+    two_factor_service = get_two_factor_service(db)
     session_service = SessionService(db) # Instantiate SessionService
 
     device_fingerprint = login_request.device_fingerprint
@@ -29,9 +29,20 @@ MAX_FIRESTORE_IN_QUERY_LIMIT = 30
 async def _get_user_details(db: firestore.AsyncClient, user_id: str) -> dict:
     if not user_id: return {}
     user_ref = db.collection(USERS_COLLECTION).document(user_id)
-    user_doc = await user_ref.get() 
+    user_doc = await user_ref.get()
     return user_doc.to_dict() if user_doc.exists else {}
 
+async def _get_users_details_map(db: firestore.AsyncClient, user_ids: List[Optional[str]]) -> Dict[str, dict]:
+    """Fetches several user profiles in one get_all round-trip instead of one get() per user."""
+    unique_ids = [uid for uid in dict.fromkeys(user_ids) if uid]
+    if not unique_ids: return {}
+    user_refs = [db.collection(USERS_COLLECTION).document(uid) for uid in unique_ids]
+    details_map = {}
+    async for user_doc in db.get_all(user_refs):
+        if user_doc.exists:
+            details_map[user_doc.id] = user_doc.to_dict()
+    return details_map
+
 async def _get_working_group_names_map(db: firestore.AsyncClient, wg_ids: List[str]) -> Dict[str, str]:
     if not wg_ids: return {}
     wg_names_map = {}
@@ -117,12 +128,13 @@ async def create_event(
             response_data['id'] = created_event_doc.id 
             response_data['workingGroupNames'] = wg_names_to_populate
 
-            creator_details = await _get_user_details(db, response_data.get("createdByUserId"))
+            users_map = await _get_users_details_map(db, [response_data.get("createdByUserId"), response_data.get("organizerUserId")])
+            creator_details = users_map.get(response_data.get("createdByUserId"), {})
             response_data["creatorFirstName"] = creator_details.get("firstName")
             response_data["creatorLastName"] = creator_details.get("lastName")
 
             if response_data.get("organizerUserId"):
-                organizer_details = await _get_user_details(db, response_data["organizerUserId"])
+                organizer_details = users_map.get(response_data["organizerUserId"], {})
                 response_data["organizerFirstName"] = organizer_details.get("firstName")
                 response_data["organizerLastName"] = organizer_details.get("lastName")
                 response_data["organizerEmail"] = organizer_details.get("email")
@@ -224,12 +236,14 @@ async def update_event(
                 if not organizer_doc.exists:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Organizer user with ID '{org_uid}' not found.")
 
-        update_data_dict["updatedAt"] = firestore.SERVER_TIMESTAMP
+        # updatedAt is set client-side (not SERVER_TIMESTAMP) so the response
+        # can be built from the merged local state without re-reading the
+        # document — saves one Firestore read per update.
+        update_data_dict["updatedAt"] = datetime.datetime.now(datetime.timezone.utc)
         await doc_ref.update(update_data_dict)
 
-        updated_event_doc = await doc_ref.get()
-        response_data = updated_event_doc.to_dict()
-        response_data['id'] = updated_event_doc.id
+        response_data = {**existing_event_data, **update_data_dict}
+        response_data['id'] = event_id
 
         if "workingGroupIds" not in response_data:
             if response_data.get("workingGroupId"):
@@ -248,12 +262,13 @@ async def update_event(
             response_data["workingGroupNames"] = [wg_details_map.get(response_data["workingGroupId"], "Unknown WG")] if response_data.get("workingGroupId") in wg_details_map else []
 
 
-        creator_details = await _get_user_details(db, response_data.get("createdByUserId"))
+        users_map = await _get_users_details_map(db, [response_data.get("createdByUserId"), response_data.get("organizerUserId")])
+        creator_details = users_map.get(response_data.get("createdByUserId"), {})
         response_data["creatorFirstName"] = creator_details.get("firstName")
         response_data["creatorLastName"] = creator_details.get("lastName")
 
         if response_data.get("organizerUserId"):
-            organizer_details = await _get_user_details(db, response_data["organizerUserId"])
+            organizer_details = users_map.get(response_data["organizerUserId"], {})
             response_data["organizerFirstName"] = organizer_details.get("firstName")
             response_data["organizerLastName"] = organizer_details.get("lastName")
             response_data["organizerEmail"] = organizer_details.get("email")
@@ -584,15 +599,16 @@ async def get_event(
             wg_names_to_populate = [fetched_wg_names_map.get(wg_id, "Unknown WG") for wg_id in event_wg_ids_list if wg_id in fetched_wg_names_map]
         event_data_from_db["workingGroupNames"] = wg_names_to_populate
 
-        creator_details = await _get_user_details(db, event_data_from_db.get("createdByUserId"))
+        users_map = await _get_users_details_map(db, [event_data_from_db.get("createdByUserId"), event_data_from_db.get("organizerUserId")])
+        creator_details = users_map.get(event_data_from_db.get("createdByUserId"), {})
         event_data_from_db["creatorFirstName"] = creator_details.get("firstName")
         event_data_from_db["creatorLastName"] = creator_details.get("lastName")
 
         if event_data_from_db.get("organizerUserId"):
-            organizer_details = await _get_user_details(db, event_data_from_db["organizerUserId"])
-            event_data_from_db["organizerFirstName"] = organizer_details.get("firstName") 
-            event_data_from_db["organizerLastName"] = organizer_details.get("lastName")  
-            event_data_from_db["organizerEmail"] = organizer_details.get("email")        
+            organizer_details = users_map.get(event_data_from_db["organizerUserId"], {})
+            event_data_from_db["organizerFirstName"] = organizer_details.get("firstName")
+            event_data_from_db["organizerLastName"] = organizer_details.get("lastName")
+            event_data_from_db["organizerEmail"] = organizer_details.get("email")
 
         is_signed_up = None
         assignment_status = None
@@ -828,24 +844,24 @@ async def list_event_assignments(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid instanceStartDateTime format. Use ISO 8601.")
 
 
-    assignments_list = []
-    user_cache = {} 
-
+    # Collect the assignments first, then resolve all user profiles in one
+    # get_all round-trip instead of one get() per unique user (N+1)
+    assignment_dicts = []
     async for assign_doc in assignments_query.stream():
         assignment_data = assign_doc.to_dict()
         assignment_data['id'] = assign_doc.id
+        assignment_dicts.append(assignment_data)
+
+    users_map = await _get_users_details_map(db, [a.get('userId') for a in assignment_dicts])
 
+    assignments_list = []
+    for assignment_data in assignment_dicts:
         user_id = assignment_data.get('userId')
-        if user_id: 
-            if user_id not in user_cache: 
-                user_details = await _get_user_details(db, user_id)
-                user_cache[user_id] = user_details
-            
-            user_profile = user_cache[user_id]
+        if user_id:
+            user_profile = users_map.get(user_id, {})
             assignment_data['userFirstName'] = user_profile.get('firstName')
             assignment_data['userLastName'] = user_profile.get('lastName')
             assignment_data['userEmail'] = user_profile.get('email')
-
         assignments_list.append(AssignmentResponse(**assignment_data))
     return assignments_list
 
@@ -988,12 +1004,13 @@ async def admin_update_event_assignment(
                 raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="User is already assigned to the target event instance.")
 
 
-    update_data_dict["updatedAt"] = firestore.SERVER_TIMESTAMP 
-    await assignment_ref.update(update_data_dict) 
+    # Client-side timestamp, as in update_event: lets the response reuse the
+    # merged local state instead of a second Firestore read.
+    update_data_dict["updatedAt"] = datetime.datetime.now(datetime.timezone.utc)
+    await assignment_ref.update(update_data_dict)
 
-    updated_assignment_doc = await assignment_ref.get()
-    response_data = updated_assignment_doc.to_dict()
-    response_data['id'] = updated_assignment_doc.id
+    response_data = {**assignment_current_data, **update_data_dict}
+    response_data['id'] = assignment_id
 
     user_profile_details = await _get_user_details(db, response_data['userId'])
     response_data['userFirstName'] = user_profile_details.get('firstName')
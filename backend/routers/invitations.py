@@ -9,7 +9,7 @@ from dependencies.database import get_db
 from dependencies.rbac import RBACUser, require_permission
 from dependencies.auth import get_current_session_user_with_rbac
 from utils.token_generator import generate_secure_token
-from services.email_service import EmailService # Import EmailService
+from services.email_service import EmailService, get_email_service # Import EmailService
 
 admin_router = APIRouter(
     prefix="/admin/invitations", 
@@ -59,10 +59,10 @@ async def ensure_associate_role_exists(db: firestore.AsyncClient) -> str:
 
 USERS_COLLECTION = "users" 
 
-# Initialize EmailService instance
+# Initialize EmailService instance (shared process-wide instance)
 # For a production app, consider FastAPI dependency injection for EmailService
 try:
-    email_service = EmailService()
+    email_service = get_email_service()
 except ValueError as e:
     print(f"Failed to initialize EmailService: {e}. Email sending will be disabled.")
     email_service = None
@@ -129,7 +129,9 @@ async def send_actual_invitation_email(
 
     print(f"Attempting to send actual invitation email to: {email_to} via Mailjet.")
     try:
-        success = await service_instance.send_email(
+        # Routed through the background queue (started in the app lifespan)
+        # so bursts of invitations coalesce into bulk Mailjet calls
+        delivery = await service_instance.enqueue_email(
             to_email=email_to,
             to_name=None, # Mailjet will use the email if name is None or empty
             subject=subject,
@@ -137,6 +139,7 @@ async def send_actual_invitation_email(
             text_content=text_content,
             custom_id=f"invitation-{token}" # Optional: for tracking
         )
+        success = await delivery
         if success:
             print(f"Invitation email successfully queued for {email_to}.")
         else:
@@ -9,8 +9,8 @@ from models.two_factor import (
 )
 from dependencies.database import get_db
 from dependencies.auth import get_firebase_user
-from services.two_factor_service import TwoFactorService
-from services.email_service import EmailService
+from services.two_factor_service import TwoFactorService, get_two_factor_service
+from services.email_service import EmailService, get_email_service
 from services.session_service import SessionService # Added SessionService import
 
 # USERS_COLLECTION is not needed here anymore as SessionService handles DB interaction for lastLoginAt
@@ -20,9 +20,9 @@ router = APIRouter(
     tags=["two-factor-authentication"]
 )
 
-# Initialize EmailService
+# Initialize EmailService (shared process-wide instance)
 try:
-    email_service = EmailService()
+    email_service = get_email_service()
 except ValueError as e:
     print(f"Failed to initialize EmailService: {e}. 2FA email sending will be disabled.")
     email_service = None
@@ -53,7 +53,7 @@ async def check_2fa_requirement(
     db: firestore.AsyncClient = Depends(get_db)
 ):
     ip_address, user_agent = get_client_info(request)
-    two_factor_service = TwoFactorService(db)
+    two_factor_service = get_two_factor_service(db)
     
     device_fingerprint = check_request.device_fingerprint
     if not device_fingerprint:
@@ -92,7 +92,7 @@ async def send_2fa_code(
         )
     
     ip_address, user_agent = get_client_info(request)
-    two_factor_service = TwoFactorService(db)
+    two_factor_service = get_two_factor_service(db)
     
     device_fingerprint = TwoFactorService.create_device_fingerprint(user_agent, ip_address)
     
@@ -176,7 +176,7 @@ async def verify_2fa_code(
         )
     
     ip_address, user_agent = get_client_info(request)
-    two_factor_service = TwoFactorService(db)
+    two_factor_service = get_two_factor_service(db)
     session_service = SessionService(db) # Instantiate SessionService
     
     device_fingerprint = (
@@ -229,7 +229,7 @@ async def get_trusted_devices(
             detail="Invalid user authentication data"
         )
     
-    two_factor_service = TwoFactorService(db)
+    two_factor_service = get_two_factor_service(db)
     
     try:
         devices = await two_factor_service.get_user_trusted_devices(user_id)
@@ -268,7 +268,7 @@ async def revoke_trusted_device(
             detail="Invalid user authentication data"
         )
     
-    two_factor_service = TwoFactorService(db)
+    two_factor_service = get_two_factor_service(db)
     
     try:
         success = await two_factor_service.revoke_device_trust(user_id, device_id)
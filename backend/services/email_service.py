@@ -1,43 +1,224 @@
+import asyncio
+import logging
 import os
-from typing import Optional, List, Dict
+import re
+import textwrap
+from functools import lru_cache
+from typing import Optional, List, Dict, Tuple
 
+import orjson
 from mailjet_rest import Client
-from dotenv import load_dotenv
+from pydantic import ValidationError
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Load environment variables from .env file
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Configuration
-MAILJET_API_KEY = os.getenv("MAILJET_API_KEY") # Corrected
-MAILJET_API_SECRET = os.getenv("MAILJET_API_SECRET") # Corrected
-EMAIL_SENDER_ADDRESS = os.getenv("EMAIL_SENDER")
-EMAIL_SENDER_NAME = os.getenv("EMAIL_SENDER_NAME", "Fiji Platform") 
+class EmailSettings(BaseSettings):
+    """
+    Mailjet configuration, read from the environment (or .env) exactly once
+    via get_email_settings() instead of scattered os.getenv calls at import.
+    """
+    mailjet_api_key: str
+    mailjet_api_secret: str
+    email_sender: str
+    email_sender_name: str = "Fiji Platform"
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+@lru_cache(maxsize=1)
+def get_email_settings() -> EmailSettings:
+    return EmailSettings()
+
+# Queueing configuration. The queue is bounded so that bursts of outgoing mail
+# apply backpressure to callers (enqueue_email blocks when full) instead of
+# growing memory without limit.
+EMAIL_QUEUE_MAXSIZE = int(os.getenv("EMAIL_QUEUE_MAXSIZE", "500"))
+EMAIL_QUEUE_WORKERS = int(os.getenv("EMAIL_QUEUE_WORKERS", "2"))
+EMAIL_BATCH_MAX_MESSAGES = 50  # Mailjet v3.1 allows up to 50 messages per call
+EMAIL_BATCH_MAX_WAIT_SECONDS = 0.1
+
+__all__ = ['EmailService', 'get_email_service']
+
+# Cheap sanity check compiled once at import. Catching obviously malformed
+# addresses locally avoids a full Mailjet round-trip (and its rate-limit
+# consumption) that would end in a 400 anyway.
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# Static 2FA email templates. Kept at module level so the large constant
+# fragments are compiled/interned once at import instead of being rebuilt as
+# f-strings on every send; only the small dynamic fields are substituted via
+# str.format_map at call time.
+#
+# The CSS is minified once here at import; the indentation and line breaks
+# added nothing semantically but shipped in every outgoing email body.
+# Braces stay doubled because the assembled template goes through format_map.
+_2FA_CSS = re.sub(r"\s+", " ", """
+    body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+    .code-box {{
+        background-color: #f8f9fa;
+        border: 2px solid #007bff;
+        border-radius: 8px;
+        padding: 20px;
+        text-align: center;
+        margin: 20px 0;
+    }}
+    .code {{
+        font-size: 32px;
+        font-weight: bold;
+        color: #007bff;
+        letter-spacing: 5px;
+        font-family: 'Courier New', monospace;
+    }}
+    .warning {{ color: #dc3545; font-weight: bold; }}
+    .footer {{ margin-top: 30px; font-size: 12px; color: #666; }}
+""").strip()
+
+_2FA_HTML_TEMPLATE = """
+        <html>
+            <head>
+                <style>""" + _2FA_CSS + """</style>
+            </head>
+            <body>
+                <div class="container">
+                    <h2>Verification Code Required</h2>
+                    <p>Hello{greeting_name},</p>
+                    <p>A sign-in attempt was made to your Fiji Platform account{device_info}.</p>
+
+                    <div class="code-box">
+                        <p>Your verification code is:</p>
+                        <div class="code">{verification_code}</div>
+                        <p><small>This code will expire in {expires_in_minutes} minutes</small></p>
+                    </div>
+
+                    <p>If you didn't request this code, please secure your account immediately by changing your password.</p>
+
+                    <p class="warning">Never share this code with anyone. Fiji Platform will never ask for your verification code.</p>
+
+                    <div class="footer">
+                        <p>This email was sent from an automated system. Please do not reply.</p>
+                        <p>© Fiji Platform Team</p>
+                    </div>
+                </div>
+            </body>
+        </html>
+        """
+
+_2FA_TEXT_TEMPLATE = textwrap.dedent("""
+Verification Code Required
+
+Hello{greeting_name},
+
+A sign-in attempt was made to your Fiji Platform account{device_info}.
+
+Your verification code is: {verification_code}
+
+This code will expire in {expires_in_minutes} minutes.
+
+If you didn't request this code, please secure your account immediately by changing your password.
+
+Never share this code with anyone. Fiji Platform will never ask for your verification code.
+
+This email was sent from an automated system. Please do not reply.
+
+© Fiji Platform Team
+""")
+
+def _serialize_payload(data: dict) -> bytes:
+    """
+    Serializes a Mailjet payload with orjson (C-accelerated) instead of the
+    stdlib json encoder the client would otherwise use. The pre-encoded bytes
+    are passed straight through as the request body; the client's default
+    Content-Type header is already application/json.
+    """
+    return orjson.dumps(data)
+
+def _response_json(result) -> dict:
+    """
+    Decodes a Mailjet response body with orjson.
+    """
+    try:
+        return orjson.loads(result.content)
+    except orjson.JSONDecodeError:
+        return {}
+
+def _extract_errors(body: dict) -> list:
+    """
+    Pulls just the per-message error details out of a failed Mailjet
+    response. Error responses echo the submitted payload (including the
+    HTML body), so logging the whole thing would serialize multi-KB blobs
+    on every failure.
+    """
+    errors = [
+        message.get('Errors')
+        for message in body.get('Messages', [])
+        if message.get('Status') != 'success'
+    ]
+    if not errors and body.get('ErrorMessage'):
+        errors = [{'ErrorMessage': body['ErrorMessage'], 'ErrorCode': body.get('ErrorCode')}]
+    return errors
 
 class EmailService:
     """
     Service for sending emails using Mailjet.
     """
-    def __init__(self):
-        if not all([MAILJET_API_KEY, MAILJET_API_SECRET, EMAIL_SENDER_ADDRESS]):
-            # Construct a more informative error message
-            missing_vars = []
-            if not MAILJET_API_KEY:
-                missing_vars.append("MAILJET_API_KEY")
-            if not MAILJET_API_SECRET:
-                missing_vars.append("MAILJET_API_SECRET")
-            if not EMAIL_SENDER_ADDRESS:
-                missing_vars.append("EMAIL_SENDER")
-            
-            error_message = (
-                "Mailjet EmailService initialization failed. "
-                f"Missing required environment variables: {', '.join(missing_vars)}. "
-                "Please ensure MAILJET_API_KEY, MAILJET_API_SECRET, and EMAIL_SENDER are set."
-            )
-            raise ValueError(error_message)
-            
-        self.client = Client(auth=(MAILJET_API_KEY, MAILJET_API_SECRET), version='v3.1')
+    def __init__(self, settings: Optional[EmailSettings] = None):
+        if settings is None:
+            try:
+                settings = get_email_settings()
+            except ValidationError as e:
+                # Keep the ValueError contract callers already handle
+                missing_vars = [str(err["loc"][0]).upper() for err in e.errors() if err["type"] == "missing"]
+                error_message = (
+                    "Mailjet EmailService initialization failed. "
+                    f"Missing required environment variables: {', '.join(missing_vars)}. "
+                    "Please ensure MAILJET_API_KEY, MAILJET_API_SECRET, and EMAIL_SENDER are set."
+                )
+                raise ValueError(error_message) from e
+
+        self.settings = settings
+        self.client = Client(auth=(settings.mailjet_api_key, settings.mailjet_api_secret), version='v3.1')
+
+        # The sender is immutable for the process lifetime, so build the
+        # 'From' header object once and share the reference across messages
+        # (Mailjet treats it as read-only input).
+        self._from = {
+            'Email': settings.email_sender,
+            'Name': settings.email_sender_name
+        }
 
-    async def send_email(
+        # Lazily created by start(); stays None when the queue is not used so
+        # direct send_email() callers are unaffected.
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+    async def start(self, num_workers: int = EMAIL_QUEUE_WORKERS) -> None:
+        """
+        Starts the background send queue and its worker tasks.
+        Safe to call more than once; subsequent calls are no-ops.
+        """
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=EMAIL_QUEUE_MAXSIZE)
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(num_workers)
+        ]
+        logger.info("EmailService queue started with %s worker(s), maxsize=%s.", num_workers, EMAIL_QUEUE_MAXSIZE)
+
+    async def stop(self) -> None:
+        """
+        Drains the queue and cancels the worker tasks.
+        """
+        if self._queue is None:
+            return
+        await self._queue.join()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._queue = None
+        self._worker_tasks = []
+
+    async def enqueue_email(
         self,
         to_email: str,
         to_name: Optional[str],
@@ -45,22 +226,139 @@ class EmailService:
         html_content: str,
         text_content: Optional[str] = None,
         custom_id: Optional[str] = None,
-        attachments: Optional[List[Dict[str, str]]] = None, 
-        cc_emails: Optional[List[Dict[str, Optional[str]]]] = None, 
-        bcc_emails: Optional[List[Dict[str, Optional[str]]]] = None 
-    ) -> bool:
+        attachments: Optional[List[Dict[str, str]]] = None,
+        cc_emails: Optional[List[Dict[str, Optional[str]]]] = None,
+        bcc_emails: Optional[List[Dict[str, Optional[str]]]] = None
+    ) -> "asyncio.Future[bool]":
         """
-        Sends an email using Mailjet.
+        Queues an email for background delivery and returns a Future that
+        resolves to the delivery result (same bool as send_email).
+
+        When the queue is full, awaiting the put() blocks the caller until a
+        worker frees a slot, giving natural backpressure under burst load.
+        The queue is started from the app lifespan; when it is not running
+        (scripts, tests), this degrades to an immediate direct send so
+        callers never depend on setup order.
         """
-        if not to_email:
-            print("Error: Recipient email (to_email) cannot be empty.")
+        if self._queue is None:
+            future: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+            future.set_result(await self.send_email(
+                to_email=to_email,
+                to_name=to_name,
+                subject=subject,
+                html_content=html_content,
+                text_content=text_content,
+                custom_id=custom_id,
+                attachments=attachments,
+                cc_emails=cc_emails,
+                bcc_emails=bcc_emails
+            ))
+            return future
+
+        if not to_email or not _EMAIL_RE.match(to_email):
+            logger.warning("Invalid or empty recipient email %r; not enqueueing.", to_email)
+            future: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+            future.set_result(False)
+            return future
+
+        cc_emails = self._filter_valid_recipients(cc_emails, "Cc")
+        bcc_emails = self._filter_valid_recipients(bcc_emails, "Bcc")
+
+        message_data = self._build_message(
+            to_email=to_email,
+            to_name=to_name,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content,
+            custom_id=custom_id,
+            attachments=attachments,
+            cc_emails=cc_emails,
+            bcc_emails=bcc_emails
+        )
+        future: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+        await self._queue.put((message_data, future))
+        return future
+
+    async def _worker(self) -> None:
+        """
+        Drains the queue, accumulating up to EMAIL_BATCH_MAX_MESSAGES messages
+        or EMAIL_BATCH_MAX_WAIT_SECONDS of waiting (whichever comes first)
+        before issuing a single bulk Mailjet call.
+        """
+        while True:
+            batch: List[Tuple[dict, "asyncio.Future[bool]"]] = [await self._queue.get()]
+            deadline = asyncio.get_running_loop().time() + EMAIL_BATCH_MAX_WAIT_SECONDS
+            while len(batch) < EMAIL_BATCH_MAX_MESSAGES:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            messages = [item[0] for item in batch]
+            try:
+                # The Mailjet client is synchronous; running it in a thread
+                # keeps the event loop (and the other workers) responsive
+                # for the duration of the HTTP call.
+                success = await asyncio.to_thread(self._send_messages, messages)
+            except Exception as e:
+                logger.error("An error occurred while sending queued emails: %s", e)
+                success = False
+
+            for _, future in batch:
+                if not future.cancelled():
+                    future.set_result(success)
+                self._queue.task_done()
+
+    def _send_messages(self, messages: List[dict]) -> bool:
+        """
+        Sends one or more pre-built message payloads in a single Mailjet call.
+        """
+        data = {'Messages': messages}
+        result = self.client.send.create(data=_serialize_payload(data))
+        if result.status_code == 200:
+            logger.info("Bulk email send successful (%s message(s)).", len(messages))
+            return True
+        else:
+            body = _response_json(result)
+            logger.error("Failed to send email batch. Status Code: %s. Errors: %s", result.status_code, _extract_errors(body))
             return False
 
+    @staticmethod
+    def _filter_valid_recipients(
+        entries: Optional[List[Dict[str, Optional[str]]]],
+        kind: str
+    ) -> Optional[List[Dict[str, Optional[str]]]]:
+        """
+        Drops entries whose 'Email' fails the local format check, so one typo
+        in a Cc/Bcc list doesn't make Mailjet reject the whole message.
+        """
+        if not entries:
+            return entries
+        valid = [entry for entry in entries if _EMAIL_RE.match(entry.get('Email') or '')]
+        if len(valid) != len(entries):
+            logger.warning("Dropping %s invalid %s recipient(s).", len(entries) - len(valid), kind)
+        return valid or None
+
+    def _build_message(
+        self,
+        to_email: str,
+        to_name: Optional[str],
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        custom_id: Optional[str] = None,
+        attachments: Optional[List[Dict[str, str]]] = None,
+        cc_emails: Optional[List[Dict[str, Optional[str]]]] = None,
+        bcc_emails: Optional[List[Dict[str, Optional[str]]]] = None
+    ) -> dict:
+        """
+        Builds a single Mailjet v3.1 message payload.
+        """
         message_data = {
-            'From': {
-                'Email': EMAIL_SENDER_ADDRESS,
-                'Name': EMAIL_SENDER_NAME
-            },
+            'From': self._from,
             'To': [
                 {
                     'Email': to_email,
@@ -73,32 +371,72 @@ class EmailService:
 
         if text_content:
             message_data['TextPart'] = text_content
-        
+
         if custom_id:
             message_data['CustomID'] = custom_id
 
         if attachments:
             message_data['Attachments'] = attachments
-        
+
         if cc_emails:
             message_data['Cc'] = cc_emails
-            
+
         if bcc_emails:
             message_data['Bcc'] = bcc_emails
 
+        return message_data
+
+    async def send_email(
+        self,
+        to_email: str,
+        to_name: Optional[str],
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        custom_id: Optional[str] = None,
+        attachments: Optional[List[Dict[str, str]]] = None, 
+        cc_emails: Optional[List[Dict[str, Optional[str]]]] = None, 
+        bcc_emails: Optional[List[Dict[str, Optional[str]]]] = None 
+    ) -> bool:
+        """
+        Sends an email using Mailjet.
+        """
+        if not to_email or not _EMAIL_RE.match(to_email):
+            logger.warning("Invalid or empty recipient email %r; not sending.", to_email)
+            return False
+
+        cc_emails = self._filter_valid_recipients(cc_emails, "Cc")
+        bcc_emails = self._filter_valid_recipients(bcc_emails, "Bcc")
+
+        message_data = self._build_message(
+            to_email=to_email,
+            to_name=to_name,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content,
+            custom_id=custom_id,
+            attachments=attachments,
+            cc_emails=cc_emails,
+            bcc_emails=bcc_emails
+        )
+
         data = {'Messages': [message_data]}
 
         try:
-            result = self.client.send.create(data=data)
+            result = self.client.send.create(data=_serialize_payload(data))
+            # Decode the response body at most once per send
             if result.status_code == 200:
-                print(f"Email sent successfully to {to_email}. Subject: {subject}. MessageID: {result.json().get('Messages', [{}])[0].get('To', [{}])[0].get('MessageID', 'N/A')}")
+                if logger.isEnabledFor(logging.INFO):
+                    body = _response_json(result)
+                    message_id = body.get('Messages', [{}])[0].get('To', [{}])[0].get('MessageID', 'N/A')
+                    logger.info("Email sent successfully to %s. Subject: %s. MessageID: %s", to_email, subject, message_id)
                 return True
             else:
-                print(f"Failed to send email. Status Code: {result.status_code}")
-                print(f"Response: {result.json()}")
+                body = _response_json(result)
+                logger.error("Failed to send email. Status Code: %s. Errors: %s", result.status_code, _extract_errors(body))
                 return False
         except Exception as e:
-            print(f"An error occurred while sending email: {str(e)}")
+            logger.error("An error occurred while sending email: %s", e)
             return False
 
     async def send_2fa_code_email(
@@ -114,7 +452,7 @@ class EmailService:
         Sends a 2FA verification code email.
         """
         if not to_email:
-            print("Error: Recipient email (to_email) cannot be empty.")
+            logger.error("Recipient email (to_email) cannot be empty.")
             return False
 
         subject = "Your verification code for Fiji Platform"
@@ -127,80 +465,19 @@ class EmailService:
             device_info = f" from {device_name}"
         elif ip_address:
             device_info = f" (IP: {ip_address})"
-        
-        html_content = f"""
-        <html>
-            <head>
-                <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                    .code-box {{ 
-                        background-color: #f8f9fa; 
-                        border: 2px solid #007bff; 
-                        border-radius: 8px; 
-                        padding: 20px; 
-                        text-align: center; 
-                        margin: 20px 0; 
-                    }}
-                    .code {{ 
-                        font-size: 32px; 
-                        font-weight: bold; 
-                        color: #007bff; 
-                        letter-spacing: 5px; 
-                        font-family: 'Courier New', monospace; 
-                    }}
-                    .warning {{ color: #dc3545; font-weight: bold; }}
-                    .footer {{ margin-top: 30px; font-size: 12px; color: #666; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h2>Verification Code Required</h2>
-                    <p>Hello{f" {to_name}" if to_name else ""},</p>
-                    <p>A sign-in attempt was made to your Fiji Platform account{device_info}.</p>
-                    
-                    <div class="code-box">
-                        <p>Your verification code is:</p>
-                        <div class="code">{verification_code}</div>
-                        <p><small>This code will expire in {expires_in_minutes} minutes</small></p>
-                    </div>
-                    
-                    <p>If you didn't request this code, please secure your account immediately by changing your password.</p>
-                    
-                    <p class="warning">Never share this code with anyone. Fiji Platform will never ask for your verification code.</p>
-                    
-                    <div class="footer">
-                        <p>This email was sent from an automated system. Please do not reply.</p>
-                        <p>© Fiji Platform Team</p>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-        
-        text_content = f"""
-Verification Code Required
-
-Hello{f" {to_name}" if to_name else ""},
-
-A sign-in attempt was made to your Fiji Platform account{device_info}.
-
-Your verification code is: {verification_code}
-
-This code will expire in {expires_in_minutes} minutes.
-
-If you didn't request this code, please secure your account immediately by changing your password.
 
-Never share this code with anyone. Fiji Platform will never ask for your verification code.
-
-This email was sent from an automated system. Please do not reply.
-
-© Fiji Platform Team
-        """
+        template_fields = {
+            "greeting_name": f" {to_name}" if to_name else "",
+            "device_info": device_info,
+            "verification_code": verification_code,
+            "expires_in_minutes": expires_in_minutes
+        }
+        html_content = _2FA_HTML_TEMPLATE.format_map(template_fields)
+        text_content = _2FA_TEXT_TEMPLATE.format_map(template_fields)
 
-        print(f"Attempting to send 2FA verification code email to: {to_email}")
+        logger.debug("Attempting to send 2FA verification code email to: %s", to_email)
         try:
-            success = await self.send_email(
+            delivery = await self.enqueue_email(
                 to_email=to_email,
                 to_name=to_name,
                 subject=subject,
@@ -208,14 +485,15 @@ This email was sent from an automated system. Please do not reply.
                 text_content=text_content,
                 custom_id=f"2fa-code-{verification_code}"
             )
+            success = await delivery
             if success:
-                print(f"2FA verification code email successfully sent to {to_email}.")
+                logger.info("2FA verification code email successfully sent to %s.", to_email)
                 return True
             else:
-                print(f"Failed to send 2FA verification code email to {to_email}.")
+                logger.error("Failed to send 2FA verification code email to %s.", to_email)
                 return False
         except Exception as e:
-            print(f"Exception during sending 2FA verification code email to {to_email}: {str(e)}")
+            logger.error("Exception during sending 2FA verification code email to %s: %s", to_email, e)
             return False
 
     async def send_donation_status_email(
@@ -231,7 +509,7 @@ This email was sent from an automated system. Please do not reply.
         Sends a donation status update email to the donor.
         """
         if not to_email:
-            print("Error: Recipient email (to_email) cannot be empty.")
+            logger.error("Recipient email (to_email) cannot be empty.")
             return False
 
         status_messages = {
@@ -321,9 +599,9 @@ This email was sent from an automated system. Please do not reply.
 © Fiji Platform Team
         """
 
-        print(f"Attempting to send donation status update email to: {to_email}")
+        logger.debug("Attempting to send donation status update email to: %s", to_email)
         try:
-            success = await self.send_email(
+            delivery = await self.enqueue_email(
                 to_email=to_email,
                 to_name=to_name,
                 subject=subject,
@@ -331,14 +609,15 @@ This email was sent from an automated system. Please do not reply.
                 text_content=text_content,
                 custom_id=f"donation-status-{new_status}"
             )
+            success = await delivery
             if success:
-                print(f"Donation status update email successfully sent to {to_email}.")
+                logger.info("Donation status update email successfully sent to %s.", to_email)
                 return True
             else:
-                print(f"Failed to send donation status update email to {to_email}.")
+                logger.error("Failed to send donation status update email to %s.", to_email)
                 return False
         except Exception as e:
-            print(f"Exception during sending donation status update email to {to_email}: {str(e)}")
+            logger.error("Exception during sending donation status update email to %s: %s", to_email, e)
             return False
 
     async def send_admin_donation_notification_email(
@@ -355,7 +634,7 @@ This email was sent from an automated system. Please do not reply.
         Sends a notification to admins when a new donation is submitted.
         """
         if not to_email:
-            print("Error: Recipient email (to_email) cannot be empty.")
+            logger.error("Recipient email (to_email) cannot be empty.")
             return False
 
         subject = "New Donation Submission Pending Review"
@@ -442,9 +721,9 @@ This email was sent from an automated system. Please do not reply.
 © Fiji Platform Team
         """
 
-        print(f"Attempting to send admin donation notification email to: {to_email}")
+        logger.debug("Attempting to send admin donation notification email to: %s", to_email)
         try:
-            success = await self.send_email(
+            delivery = await self.enqueue_email(
                 to_email=to_email,
                 to_name=to_name,
                 subject=subject,
@@ -452,16 +731,33 @@ This email was sent from an automated system. Please do not reply.
                 text_content=text_content,
                 custom_id=f"admin-donation-notification"
             )
+            success = await delivery
             if success:
-                print(f"Admin donation notification email successfully sent to {to_email}.")
+                logger.info("Admin donation notification email successfully sent to %s.", to_email)
                 return True
             else:
-                print(f"Failed to send admin donation notification email to {to_email}.")
+                logger.error("Failed to send admin donation notification email to %s.", to_email)
                 return False
         except Exception as e:
-            print(f"Exception during sending admin donation notification email to {to_email}: {str(e)}")
+            logger.error("Exception during sending admin donation notification email to %s: %s", to_email, e)
             return False
 
+# Process-wide singleton. Each EmailService owns a Mailjet Client with its own
+# requests.Session connection pool, so constructing one per importing module
+# (previously two_factor.py and invitations.py each built their own) duplicated
+# setup work and connection pools for no benefit.
+_email_service_instance: Optional[EmailService] = None
+
+def get_email_service() -> EmailService:
+    """
+    Returns the shared EmailService instance, creating it on first use.
+    Raises ValueError (like EmailService()) if Mailjet env vars are missing.
+    """
+    global _email_service_instance
+    if _email_service_instance is None:
+        _email_service_instance = EmailService()
+    return _email_service_instance
+
 # Example usage (for testing purposes, normally this would be in a different part of the app)
 # async def main_test():
 #     # Ensure .env is loaded if running this standalone for testing
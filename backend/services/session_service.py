@@ -1,8 +1,20 @@
+import asyncio
+import base64
+import logging
 import os
+import time
+
+import orjson
+from functools import lru_cache
 from firebase_admin import firestore
-from jose import JWTError, jwt
+# PyJWT delegates HMAC to OpenSSL (hardware SHA extensions where available),
+# unlike python-jose's pure-Python HS256 path.
+import jwt
+from jwt import InvalidTokenError
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 USERS_COLLECTION = "users"
 
@@ -10,8 +22,70 @@ USERS_COLLECTION = "users"
 # For demonstration, using hardcoded (but random-looking) values.
 # Ensure you generate a strong, random secret key for production.
 SECRET_KEY = os.getenv("BACKEND_SESSION_SECRET_KEY", "a_very_secure_secret_key_for_jwt_fiji_project_12345!@#$%")
+# PyJWT accepts the key as bytes; encoding it once here avoids a per-call
+# UTF-8 encode on every token issued or verified.
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("BACKEND_SESSION_EXPIRE_MINUTES", "60")) # Default to 60 minutes
+_EXPIRE_DELTA = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+def _unverified_exp(token: str) -> Optional[int]:
+    """
+    Best-effort peek at the exp claim without verifying the signature.
+    Returns None when the token is too malformed to read a payload.
+    """
+    try:
+        payload_b64 = token.split('.')[1]
+        payload = orjson.loads(base64.urlsafe_b64decode(payload_b64 + '=' * (-len(payload_b64) % 4)))
+        return payload.get('exp', 0)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _decode_cached(token: str) -> Tuple[int, Optional[dict]]:
+    """
+    Decodes and signature-verifies a session token, caching the result by
+    token string. verify_session_token is called on every authenticated
+    request, so warm tokens skip the HMAC + base64 + JSON work entirely.
+
+    Expiry is deliberately NOT verified here (the cached payload would go
+    stale); callers must compare the returned exp against the current time.
+    Invalid tokens are cached as (0, None) so repeated garbage doesn't
+    re-enter the HMAC path. Call _decode_cached.cache_clear() if SECRET_KEY
+    is ever rotated at runtime.
+    """
+    # An already-expired token is rejected regardless of its signature, so a
+    # cheap base64 peek at exp lets stale-cookie floods skip the HMAC work.
+    exp = _unverified_exp(token)
+    if exp is not None and exp < time.time():
+        return (exp, None)
+
+    try:
+        payload = jwt.decode(token, _SECRET_KEY_BYTES, algorithms=[ALGORITHM], options={"verify_exp": False})
+    except InvalidTokenError as e:
+        # Handles various errors: InvalidSignatureError, malformed tokens, etc.
+        logger.info("JWT Verification Error: %s", e)
+        return (0, None)
+    return (payload.get("exp", 0), payload)
+
+# Strong references to in-flight lastLoginAt tasks. The event loop only
+# keeps weak references to tasks, so without this a fire-and-forget update
+# can be garbage-collected before it runs; the done-callback discards each
+# task once it completes.
+_background_tasks: set = set()
+
+
+def _log_last_login_write(task: "asyncio.Task", user_id: str) -> None:
+    """Done-callback for the fire-and-forget lastLoginAt update."""
+    _background_tasks.discard(task)
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.error("Error updating lastLoginAt for user %s: %s", user_id, error)
+
 
 class SessionService:
     def __init__(self, db: firestore.AsyncClient):
@@ -22,24 +96,26 @@ class SessionService:
         Creates a JWT session token for the user and updates lastLoginAt.
         """
         user_ref = self.db.collection(USERS_COLLECTION).document(user_id)
-        try:
-            await user_ref.update({
-                "lastLoginAt": firestore.SERVER_TIMESTAMP,
-                "updatedAt": firestore.SERVER_TIMESTAMP
-            })
-            print(f"Updated lastLoginAt for user {user_id}")
-        except Exception as e:
-            print(f"Error updating lastLoginAt for user {user_id}: {e}")
-            # Consider if this error should prevent token issuance
-
-        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        # Fire-and-forget: token issuance shouldn't wait on the Firestore
+        # round-trip, and a failed lastLoginAt write shouldn't prevent login.
+        # updatedAt is no longer touched here; lastLoginAt already records
+        # the login, and dropping it halves the fields written per session.
+        update_task = asyncio.create_task(
+            user_ref.update({"lastLoginAt": firestore.SERVER_TIMESTAMP})
+        )
+        _background_tasks.add(update_task)
+        update_task.add_done_callback(
+            lambda task, uid=user_id: _log_last_login_write(task, uid)
+        )
+
+        now = datetime.now(timezone.utc)
         to_encode = {
             "sub": user_id,
-            "exp": expire,
-            "iat": datetime.now(timezone.utc), # Issued at
+            "exp": now + _EXPIRE_DELTA,
+            "iat": now, # Issued at
             "token_type": "backend_session" # Custom claim
         }
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=ALGORITHM)
         return encoded_jwt
 
     async def verify_session_token(self, token: str) -> Optional[dict]:
@@ -47,18 +123,17 @@ class SessionService:
         Verifies a backend-issued JWT session token.
         Returns a dictionary containing user_id (as 'uid') and other claims if valid, None otherwise.
         """
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            user_id: Optional[str] = payload.get("sub")
-            token_type: Optional[str] = payload.get("token_type")
-
-            if user_id is None or token_type != "backend_session":
-                # Missing subject or incorrect token type
-                return None 
-            
-            # Token is valid, return relevant claims (especially uid)
-            return {"uid": user_id, **payload} # Return all claims including uid
-        except JWTError as e:
-            # Handles various errors: ExpiredSignatureError, InvalidTokenError, etc.
-            print(f"JWT Verification Error: {e}")
+        exp, payload = _decode_cached(token)
+        if payload is None or exp < time.time():
+            # Invalid signature/malformed token, or expired
             return None
+
+        user_id: Optional[str] = payload.get("sub")
+        token_type: Optional[str] = payload.get("token_type")
+
+        if user_id is None or token_type != "backend_session":
+            # Missing subject or incorrect token type
+            return None
+
+        # Token is valid, return relevant claims (especially uid)
+        return {"uid": user_id, **payload} # Return all claims including uid
@@ -1,7 +1,13 @@
+import asyncio
+import base64
+import hmac
 import os
+import re
 import secrets
 import hashlib
+from collections import deque
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional, Tuple
 from firebase_admin import firestore
 
@@ -20,6 +26,94 @@ CODE_EXPIRY_MINUTES = int(os.getenv("TWO_FACTOR_CODE_EXPIRY_MINUTES", "10"))
 DEVICE_TRUST_DAYS = int(os.getenv("DEVICE_TRUST_DAYS", "7"))
 MAX_CODE_ATTEMPTS = int(os.getenv("MAX_2FA_ATTEMPTS", "3"))
 
+# With TRUSTED_DOCS=1, models built from our own Firestore documents (and
+# from data we just wrote) skip Pydantic validation via model_construct —
+# a per-field CPU saving on the auth hot path. Leave unset in dev to keep
+# full validation.
+if os.getenv("TRUSTED_DOCS", "0") == "1":
+    _build_trusted_device = TrustedDevice.model_construct
+    _build_two_factor_code = TwoFactorCode.model_construct
+else:
+    _build_trusted_device = TrustedDevice
+    _build_two_factor_code = TwoFactorCode
+
+
+# Device tokens are drawn from a pre-generated pool so the login hot path
+# pays a deque pop instead of an entropy syscall; refills read the entropy
+# for the whole pool in a single os.urandom call. The encoding matches
+# secrets.token_urlsafe(32): urlsafe base64, padding stripped.
+_TOKEN_BYTES = 32
+_TOKEN_POOL_SIZE = 256
+_TOKEN_POOL: deque = deque()
+
+
+def _refill_token_pool() -> None:
+    raw = os.urandom(_TOKEN_BYTES * _TOKEN_POOL_SIZE)
+    _TOKEN_POOL.extend(
+        base64.urlsafe_b64encode(raw[start:start + _TOKEN_BYTES]).rstrip(b"=").decode("ascii")
+        for start in range(0, len(raw), _TOKEN_BYTES)
+    )
+
+
+@lru_cache(maxsize=4096)
+def _fingerprint(user_agent: str) -> str:
+    """
+    Hash a user agent to the 16-hex-char device fingerprint. User agents have
+    very low cardinality per deployment, so memoizing makes the hot path a
+    dict lookup; the digest itself stays SHA-256 so fingerprints already
+    stored in trustedDevices remain valid. Hex-encoding only the 8 digest
+    bytes that survive the truncation yields the same string as
+    hexdigest()[:16] without converting the other 24.
+    """
+    return hashlib.sha256(user_agent.encode()).digest()[:8].hex()
+
+
+# Compiled alternations so classifying a user agent is one C-level scan per
+# category instead of ~10 Python-level substring searches
+_BROWSER_TOKENS_RE = re.compile(r"edge|chrome|firefox|safari")
+_OS_TOKENS_RE = re.compile(r"windows|mac|linux|android|iphone|ipad")
+
+
+@lru_cache(maxsize=2048)
+def _device_name(user_agent: str) -> str:
+    """
+    Classify a raw user agent into "<Browser> on <OS>". Cached on the raw
+    string: UA cardinality is tiny per deployment, so warm calls skip the
+    scans entirely.
+    """
+    ua = user_agent.lower()
+    browser_tokens = set(_BROWSER_TOKENS_RE.findall(ua))
+    os_tokens = set(_OS_TOKENS_RE.findall(ua))
+
+    # Same priority order as the old substring chain: Edge UAs also contain
+    # "chrome", and Chrome UAs also contain "safari"
+    if "chrome" in browser_tokens and "edge" not in browser_tokens:
+        browser = "Chrome"
+    elif "firefox" in browser_tokens:
+        browser = "Firefox"
+    elif "safari" in browser_tokens and "chrome" not in browser_tokens:
+        browser = "Safari"
+    elif "edge" in browser_tokens:
+        browser = "Edge"
+    else:
+        browser = "Unknown Browser"
+
+    if "windows" in os_tokens:
+        os_name = "Windows"
+    elif "mac" in os_tokens:
+        os_name = "macOS"
+    elif "linux" in os_tokens:
+        os_name = "Linux"
+    elif "android" in os_tokens:
+        os_name = "Android"
+    elif "iphone" in os_tokens or "ipad" in os_tokens:
+        os_name = "iOS"
+    else:
+        os_name = "Unknown OS"
+
+    return f"{browser} on {os_name}"
+
+
 class TwoFactorService:
     """Service for managing 2FA verification codes and trusted devices"""
     
@@ -34,13 +128,18 @@ class TwoFactorService:
     @staticmethod
     def generate_device_token() -> str:
         """Generate a secure token for trusted devices"""
-        return secrets.token_urlsafe(32)
+        if not _TOKEN_POOL:
+            _refill_token_pool()
+        try:
+            return _TOKEN_POOL.popleft()
+        except IndexError:
+            # Lost a race for the last pooled token; fall back to a direct read
+            return secrets.token_urlsafe(_TOKEN_BYTES)
     
     @staticmethod
     def create_device_fingerprint(user_agent: Optional[str], ip_address: Optional[str]) -> str:
         """Create a device fingerprint hash from user agent only (IP can change)"""
-        data = f"{user_agent or 'unknown'}"
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+        return _fingerprint(user_agent or 'unknown')
     
     async def create_verification_code(
         self, 
@@ -51,10 +150,7 @@ class TwoFactorService:
         purpose: str = "login"
     ) -> TwoFactorCode:
         """Create a new 2FA verification code for a user"""
-        
-        # Invalidate any existing active codes for this user
-        await self._invalidate_existing_codes(user_id, purpose)
-        
+
         # Generate new code
         code = self.generate_code()
         created_at = datetime.now(timezone.utc)
@@ -64,8 +160,12 @@ class TwoFactorService:
         if not device_fingerprint:
             device_fingerprint = self.create_device_fingerprint(user_agent, ip_address)
         
-        # Create code document
-        code_doc_ref = self.db.collection(TWO_FACTOR_CODES_COLLECTION).document()
+        # The active code lives under a deterministic doc ID, so issuing a
+        # new code overwrites (and thereby invalidates) the previous one in
+        # the same write, and verification becomes a single point-read
+        code_doc_ref = self.db.collection(TWO_FACTOR_CODES_COLLECTION).document(
+            self._code_doc_id(user_id, purpose)
+        )
         code_data = {
             "id": code_doc_ref.id,
             "user_id": user_id,
@@ -83,40 +183,47 @@ class TwoFactorService:
         
         await code_doc_ref.set(code_data)
         
-        return TwoFactorCode(**code_data)
+        return _build_two_factor_code(**code_data)
     
     async def verify_code(
-        self, 
-        user_id: str, 
+        self,
+        user_id: str,
         code: str,
         device_fingerprint: Optional[str] = None,
-        remember_device: bool = True
+        remember_device: bool = True,
+        purpose: str = "login"
     ) -> TwoFactorVerifyResponse:
         """Verify a 2FA code and optionally mark device as trusted"""
-        
-        # Find the code
-        codes_query = self.db.collection(TWO_FACTOR_CODES_COLLECTION)\
-            .where("user_id", "==", user_id)\
-            .where("code", "==", code)\
-            .where("is_used", "==", False)\
-            .where("is_expired", "==", False)\
-            .limit(1)
-        
-        codes_docs = await codes_query.get()
-        
-        if not codes_docs:
+
+        # Point-read the user's active code by its deterministic doc ID: the
+        # cheapest Firestore operation, replacing the old four-predicate query
+        code_doc = await self.db.collection(TWO_FACTOR_CODES_COLLECTION)\
+            .document(self._code_doc_id(user_id, purpose)).get()
+
+        if not code_doc.exists:
             return TwoFactorVerifyResponse(success=False)
-        
-        code_doc = codes_docs[0]
+
         code_data = code_doc.to_dict()
-        
+
+        # Constant-time comparison: the equality check now happens client-side
+        # (no Firestore predicate on the code), so it must not leak timing.
+        # Compared as bytes: compare_digest raises TypeError on non-ASCII
+        # str input, and the request model doesn't constrain the charset.
+        if not hmac.compare_digest((code_data.get("code") or "").encode(), code.encode()):
+            return TwoFactorVerifyResponse(success=False)
+
+        if code_data.get("is_used") or code_data.get("is_expired"):
+            return TwoFactorVerifyResponse(success=False)
+
+        now = datetime.now(timezone.utc)
+
         # Check if code is expired
         expires_at = code_data.get("expires_at")
         if isinstance(expires_at, datetime):
             if expires_at.tzinfo is None:
                 expires_at = expires_at.replace(tzinfo=timezone.utc)
             
-            if expires_at < datetime.now(timezone.utc):
+            if expires_at < now:
                 # Mark as expired
                 await code_doc.reference.update({
                     "is_expired": True,
@@ -124,27 +231,33 @@ class TwoFactorService:
                 })
                 return TwoFactorVerifyResponse(success=False)
         
-        # Mark code as used
-        await code_doc.reference.update({
+        # Mark the code used and (optionally) create the trusted device
+        # concurrently: they touch different documents, so there is no write
+        # conflict and the verify path only pays the slower of the two RTTs.
+        mark_used_coro = code_doc.reference.update({
             "is_used": True,
             "used_at": firestore.SERVER_TIMESTAMP,
             "updated_at": firestore.SERVER_TIMESTAMP
         })
-        
-        # Create trusted device if requested
+
         device_token = None
         expires_at = None
-        
+
         if remember_device and device_fingerprint:
-            trusted_device = await self._create_trusted_device(
-                user_id, 
-                device_fingerprint,
-                code_data.get("ip_address"),
-                code_data.get("user_agent")
+            _, trusted_device = await asyncio.gather(
+                mark_used_coro,
+                self._create_trusted_device(
+                    user_id,
+                    device_fingerprint,
+                    code_data.get("ip_address"),
+                    code_data.get("user_agent")
+                )
             )
             device_token = trusted_device.device_token
             expires_at = trusted_device.expires_at
-        
+        else:
+            await mark_used_coro
+
         return TwoFactorVerifyResponse(
             success=True,
             device_token=device_token,
@@ -153,42 +266,34 @@ class TwoFactorService:
     
     async def check_device_trust(self, user_id: str, device_fingerprint: str) -> Optional[TrustedDevice]:
         """Check if a device is trusted for a user"""
-        
+
+        # Expiry is filtered server-side (composite index in
+        # firestore_indexes.json), so expired devices never reach Python and
+        # the read path does no deactivation writes; stale documents are
+        # removed by utils/cleanup_trusted_devices.py (run periodically).
+        now = datetime.now(timezone.utc)
         devices_query = self.db.collection(TRUSTED_DEVICES_COLLECTION)\
             .where("user_id", "==", user_id)\
             .where("device_fingerprint", "==", device_fingerprint)\
             .where("is_active", "==", True)\
+            .where("expires_at", ">", now)\
             .limit(1)
-        
+
         devices_docs = await devices_query.get()
-        
+
         if not devices_docs:
             return None
-        
+
         device_doc = devices_docs[0]
         device_data = device_doc.to_dict()
-        
-        # Check if device trust has expired
-        expires_at = device_data.get("expires_at")
-        if isinstance(expires_at, datetime):
-            if expires_at.tzinfo is None:
-                expires_at = expires_at.replace(tzinfo=timezone.utc)
-            
-            if expires_at < datetime.now(timezone.utc):
-                # Mark as inactive
-                await device_doc.reference.update({
-                    "is_active": False,
-                    "updated_at": firestore.SERVER_TIMESTAMP
-                })
-                return None
-        
+
         # Update last used timestamp
         await device_doc.reference.update({
             "last_used_at": firestore.SERVER_TIMESTAMP,
             "updated_at": firestore.SERVER_TIMESTAMP
         })
-        
-        return TrustedDevice(**device_data)
+
+        return _build_trusted_device(**device_data)
     
     async def revoke_device_trust(self, user_id: str, device_id: str) -> bool:
         """Revoke trust for a specific device"""
@@ -212,55 +317,33 @@ class TwoFactorService:
     
     async def get_user_trusted_devices(self, user_id: str) -> list[TrustedDevice]:
         """Get all trusted devices for a user"""
-        
+
+        # Expiry is filtered server-side so the read path never scans or
+        # deactivates stale documents (that housekeeping lives in
+        # utils/cleanup_trusted_devices.py). Firestore would require the
+        # range-filtered field to be the primary sort key, so the
+        # last_used_at ordering is applied locally on the (small) per-user
+        # result set instead.
+        now = datetime.now(timezone.utc)
         devices_query = self.db.collection(TRUSTED_DEVICES_COLLECTION)\
             .where("user_id", "==", user_id)\
             .where("is_active", "==", True)\
-            .order_by("last_used_at", direction=firestore.Query.DESCENDING)
-        
-        devices_docs = await devices_query.get()
-        
-        devices = []
-        current_time = datetime.now(timezone.utc)
-        
-        for device_doc in devices_docs:
-            device_data = device_doc.to_dict()
-            
-            # Check if device has expired
-            expires_at = device_data.get("expires_at")
-            if isinstance(expires_at, datetime):
-                if expires_at.tzinfo is None:
-                    expires_at = expires_at.replace(tzinfo=timezone.utc)
-                
-                if expires_at < current_time:
-                    # Mark as inactive
-                    await device_doc.reference.update({
-                        "is_active": False,
-                        "updated_at": firestore.SERVER_TIMESTAMP
-                    })
-                    continue
-            
-            devices.append(TrustedDevice(**device_data))
-        
+            .where("expires_at", ">", now)
+
+        # Stream rather than materializing the whole result set first, so
+        # model construction overlaps with the network receive
+        devices = [
+            _build_trusted_device(**device_doc.to_dict())
+            async for device_doc in devices_query.stream()
+        ]
+        devices.sort(key=lambda device: device.last_used_at, reverse=True)
         return devices
     
-    async def _invalidate_existing_codes(self, user_id: str, purpose: str) -> None:
-        """Invalidate existing active codes for a user"""
-        
-        codes_query = self.db.collection(TWO_FACTOR_CODES_COLLECTION)\
-            .where("user_id", "==", user_id)\
-            .where("purpose", "==", purpose)\
-            .where("is_used", "==", False)\
-            .where("is_expired", "==", False)
-        
-        codes_docs = await codes_query.get()
-        
-        for code_doc in codes_docs:
-            await code_doc.reference.update({
-                "is_expired": True,
-                "updated_at": firestore.SERVER_TIMESTAMP
-            })
-    
+    @staticmethod
+    def _code_doc_id(user_id: str, purpose: str) -> str:
+        """Deterministic doc ID for a user's single active code per purpose"""
+        return f"{user_id}:{purpose}"
+
     async def _create_trusted_device(
         self, 
         user_id: str, 
@@ -285,6 +368,7 @@ class TwoFactorService:
         if existing_docs:
             # Update existing device
             device_doc = existing_docs[0]
+            device_data = device_doc.to_dict()
             await device_doc.reference.update({
                 "device_token": device_token,
                 "is_active": True,
@@ -292,9 +376,16 @@ class TwoFactorService:
                 "expires_at": expires_at,
                 "updated_at": firestore.SERVER_TIMESTAMP
             })
-            
-            updated_doc = await device_doc.reference.get()
-            return TrustedDevice(**updated_doc.to_dict())
+
+            # Rebuild the model from data we already have instead of paying a
+            # read round-trip just to echo back the fields we just wrote
+            device_data.update({
+                "device_token": device_token,
+                "is_active": True,
+                "last_used_at": created_at,
+                "expires_at": expires_at
+            })
+            return _build_trusted_device(**device_data)
         else:
             # Create new device
             device_doc_ref = self.db.collection(TRUSTED_DEVICES_COLLECTION).document()
@@ -313,40 +404,28 @@ class TwoFactorService:
             }
             
             await device_doc_ref.set(device_data)
-            return TrustedDevice(**device_data)
+            return _build_trusted_device(**device_data)
     
     @staticmethod
     def _generate_device_name(user_agent: Optional[str]) -> Optional[str]:
         """Generate a human-readable device name from user agent"""
         if not user_agent:
             return None
-        
-        user_agent = user_agent.lower()
-        
-        # Detect browser
-        if "chrome" in user_agent and "edge" not in user_agent:
-            browser = "Chrome"
-        elif "firefox" in user_agent:
-            browser = "Firefox"
-        elif "safari" in user_agent and "chrome" not in user_agent:
-            browser = "Safari"
-        elif "edge" in user_agent:
-            browser = "Edge"
-        else:
-            browser = "Unknown Browser"
-        
-        # Detect OS
-        if "windows" in user_agent:
-            os_name = "Windows"
-        elif "mac" in user_agent:
-            os_name = "macOS"
-        elif "linux" in user_agent:
-            os_name = "Linux"
-        elif "android" in user_agent:
-            os_name = "Android"
-        elif "iphone" in user_agent or "ipad" in user_agent:
-            os_name = "iOS"
-        else:
-            os_name = "Unknown OS"
-        
-        return f"{browser} on {os_name}"
\ No newline at end of file
+        return _device_name(user_agent)
+
+
+_two_factor_service_instance: Optional[TwoFactorService] = None
+
+
+def get_two_factor_service(db: firestore.AsyncClient) -> TwoFactorService:
+    """
+    Return the shared TwoFactorService bound to the given Firestore client.
+
+    The service is stateless apart from the client handle, so one instance
+    per process suffices; rebinding only happens if the client itself is
+    replaced (e.g. in tests that swap app.state.db).
+    """
+    global _two_factor_service_instance
+    if _two_factor_service_instance is None or _two_factor_service_instance.db is not db:
+        _two_factor_service_instance = TwoFactorService(db)
+    return _two_factor_service_instance
\ No newline at end of file
@@ -17,6 +17,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.cloud.firestore_v1.field_path import FieldPath
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -27,31 +28,41 @@ USERS_COLLECTION = "users"
 ASSIGNMENTS_COLLECTION = "assignments"
 GLOBAL_WG_ID = "organization-wide"
 
+# Reused across calls so repeated runs in one process don't rebuild the
+# gRPC channel
+_db_client = None
+
 async def initialize_firebase():
     """Initialize Firebase Admin SDK"""
+    global _db_client
+    if _db_client is not None:
+        return _db_client
+
     if firebase_admin._apps:
-        return firestore.AsyncClient()
-    
+        _db_client = firestore.AsyncClient()
+        return _db_client
+
     project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
     if not project_id:
         raise ValueError("GOOGLE_CLOUD_PROJECT environment variable not set")
-    
-    try:
-        # Try Application Default Credentials first
-        cred = credentials.ApplicationDefault()
-        firebase_admin.initialize_app(cred, {'projectId': project_id})
-        print(f"✅ Firebase initialized for project: {project_id}")
-    except Exception:
-        # Fallback to service account key
-        gac_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-        if gac_path:
-            cred = credentials.Certificate(gac_path)
-            firebase_admin.initialize_app(cred, {'projectId': project_id})
-            print(f"✅ Firebase initialized for project: {project_id}")
-        else:
+
+    # When a service account key is configured, use it directly instead of
+    # probing Application Default Credentials first (the ADC probe can hit
+    # the metadata server before falling back)
+    gac_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    if gac_path:
+        cred = credentials.Certificate(gac_path)
+    else:
+        try:
+            cred = credentials.ApplicationDefault()
+        except Exception:
             raise ValueError("Failed to initialize Firebase - no valid credentials found")
-    
-    return firestore.AsyncClient(project=project_id)
+
+    firebase_admin.initialize_app(cred, {'projectId': project_id})
+    print(f"✅ Firebase initialized for project: {project_id}")
+
+    _db_client = firestore.AsyncClient(project=project_id)
+    return _db_client
 
 async def simulate_working_groups_endpoint(db: firestore.AsyncClient, user_id: str = None):
     """
@@ -59,97 +70,128 @@ async def simulate_working_groups_endpoint(db: firestore.AsyncClient, user_id: s
     This mimics the logic in routers/working_groups.py
     """
     print(f"🔍 Testing working groups endpoint logic...")
-    
-    # Get all working groups
-    groups_query = db.collection(WORKING_GROUPS_COLLECTION).order_by("groupName", direction=firestore.Query.ASCENDING)
+
+    # Test user assignment logic (if user_id provided)
+    if user_id:
+        print(f"🔍 Testing user assignment logic for user {user_id}...")
+
+        # Get user's working group assignments
+        user_wg_assignments_query = db.collection(ASSIGNMENTS_COLLECTION) \
+            .where("userId", "==", user_id) \
+            .where("assignableType", "==", "workingGroup") \
+            .select(["assignableId"])
+
+        assignments = user_wg_assignments_query.stream()
+        allowed_wg_ids = []
+
+        async for doc in assignments:
+            assignment_data = doc.to_dict()
+            allowed_wg_ids.append(assignment_data["assignableId"])
+
+        print(f"   User's assigned working groups: {allowed_wg_ids}")
+
+        # Simulate the new logic that always includes global WG
+        if GLOBAL_WG_ID not in allowed_wg_ids:
+            allowed_wg_ids.append(GLOBAL_WG_ID)
+            print(f"   Added global working group: {allowed_wg_ids}")
+
+        # Fetch only the allowed groups by document ID ('in' accepts up to 30
+        # values per query, so chunk and fan the queries out concurrently)
+        # instead of reading the whole collection and filtering in Python
+        id_chunks = [allowed_wg_ids[i:i + 30] for i in range(0, len(allowed_wg_ids), 30)]
+        chunk_snapshots = await asyncio.gather(*(
+            db.collection(WORKING_GROUPS_COLLECTION)
+            .where(FieldPath.document_id(), "in", chunk)
+            .select(["groupName", "status", "isGlobal"])
+            .get()
+            for chunk in id_chunks
+        ))
+
+        # to_dict + dict.get so legacy docs missing a projected field (e.g.
+        # isGlobal) default instead of raising KeyError from snapshot.get()
+        filtered_groups = []
+        for snapshot in chunk_snapshots:
+            for doc in snapshot:
+                group_data = doc.to_dict()
+                filtered_groups.append({
+                    'id': doc.id,
+                    'groupName': group_data.get('groupName'),
+                    'status': group_data.get('status'),
+                    'isGlobal': group_data.get('isGlobal', False)
+                })
+        print(f"   Filtered groups count: {len(filtered_groups)}")
+
+        global_in_filtered = any(g['id'] == GLOBAL_WG_ID for g in filtered_groups)
+        if global_in_filtered:
+            print(f"   ✅ Global working group appears in filtered results")
+        else:
+            print(f"   ❌ Global working group missing from filtered results")
+
+        return global_in_filtered
+
+    # No user filter: list the whole collection, projected down to the
+    # fields this script actually reads (smaller responses, less dict building)
+    groups_query = db.collection(WORKING_GROUPS_COLLECTION) \
+        .select(["groupName", "status", "isGlobal"]) \
+        .order_by("groupName", direction=firestore.Query.ASCENDING)
     docs_snapshot = groups_query.stream()
-    
+
     all_groups = []
     async for doc in docs_snapshot:
         group_data = doc.to_dict()
-        group_data['id'] = doc.id
         all_groups.append({
             'id': doc.id,
             'groupName': group_data.get('groupName'),
             'status': group_data.get('status'),
             'isGlobal': group_data.get('isGlobal', False)
         })
-    
+
     print(f"📊 Total working groups in database: {len(all_groups)}")
-    
+
     # Find the global working group
     global_wg = None
     for group in all_groups:
         if group['id'] == GLOBAL_WG_ID:
             global_wg = group
             break
-    
+
     if global_wg:
         print(f"✅ Global working group found:")
         print(f"   ID: {global_wg['id']}")
         print(f"   Name: {global_wg['groupName']}")
         print(f"   Status: {global_wg['status']}")
         print(f"   Is Global: {global_wg['isGlobal']}")
-    else:
-        print(f"❌ Global working group '{GLOBAL_WG_ID}' not found!")
-        print("   Available working groups:")
-        for group in all_groups:
-            print(f"   - {group['id']}: {group['groupName']}")
-        return False
-    
-    # Test user assignment logic (if user_id provided)
-    if user_id:
-        print(f"\n🔍 Testing user assignment logic for user {user_id}...")
-        
-        # Get user's working group assignments
-        user_wg_assignments_query = db.collection(ASSIGNMENTS_COLLECTION) \
-            .where("userId", "==", user_id) \
-            .where("assignableType", "==", "workingGroup")
-        
-        assignments = user_wg_assignments_query.stream()
-        allowed_wg_ids = []
-        
-        async for doc in assignments:
-            assignment_data = doc.to_dict()
-            allowed_wg_ids.append(assignment_data["assignableId"])
-        
-        print(f"   User's assigned working groups: {allowed_wg_ids}")
-        
-        # Simulate the new logic that always includes global WG
-        if GLOBAL_WG_ID not in allowed_wg_ids:
-            allowed_wg_ids.append(GLOBAL_WG_ID)
-            print(f"   Added global working group: {allowed_wg_ids}")
-        
-        # Filter groups based on allowed IDs
-        filtered_groups = [g for g in all_groups if g['id'] in allowed_wg_ids]
-        print(f"   Filtered groups count: {len(filtered_groups)}")
-        
-        global_in_filtered = any(g['id'] == GLOBAL_WG_ID for g in filtered_groups)
-        if global_in_filtered:
-            print(f"   ✅ Global working group appears in filtered results")
-        else:
-            print(f"   ❌ Global working group missing from filtered results")
-            
-        return global_in_filtered
-    
-    return True
+        return True
 
-async def test_with_sample_user(db: firestore.AsyncClient):
+    print(f"❌ Global working group '{GLOBAL_WG_ID}' not found!")
+    print("   Available working groups:")
+    for group in all_groups:
+        print(f"   - {group['id']}: {group['groupName']}")
+    return False
+
+def fetch_sample_user(db: firestore.AsyncClient):
+    """Return the (unawaited) query for one sample user.
+
+    Only the fields used to label the test output are fetched. The caller
+    awaits this alongside other queries so the lookups overlap.
+    """
+    return db.collection(USERS_COLLECTION) \
+        .select(["firstName", "lastName", "email"]) \
+        .limit(1) \
+        .get()
+
+async def test_with_sample_user(db: firestore.AsyncClient, users_docs):
     """Test with a sample user from the database"""
     print(f"\n🔍 Finding a sample user to test with...")
-    
-    # Get a sample user
-    users_query = db.collection(USERS_COLLECTION).limit(1)
-    users_docs = users_query.stream()
-    
+
     sample_user = None
-    async for user_doc in users_docs:
+    for user_doc in users_docs:
         sample_user = {
             'id': user_doc.id,
             'data': user_doc.to_dict()
         }
         break
-    
+
     if sample_user:
         user_name = f"{sample_user['data'].get('firstName', '')} {sample_user['data'].get('lastName', '')}".strip()
         user_name = user_name or sample_user['data'].get('email', sample_user['id'])
@@ -169,12 +211,17 @@ async def main():
         # Initialize Firebase
         db = await initialize_firebase()
         
-        # Test basic working groups listing
-        basic_test = await simulate_working_groups_endpoint(db)
-        
+        # Test basic working groups listing; the sample-user lookup for the
+        # second stage runs concurrently so total latency is the max of the
+        # two round-trips, not the sum
+        basic_test, users_docs = await asyncio.gather(
+            simulate_working_groups_endpoint(db),
+            fetch_sample_user(db)
+        )
+
         if basic_test:
             # Test with a real user
-            user_test = await test_with_sample_user(db)
+            user_test = await test_with_sample_user(db, users_docs)
             
             print("\n" + "=" * 60)
             if user_test:
@@ -1,6 +1,10 @@
+import asyncio
+import logging
 import pytest
+from fastapi import Request
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch
+from httpx import ASGITransport, AsyncClient
+from unittest.mock import AsyncMock, MagicMock, patch
 import os
 import firebase_admin # Import for manipulating _apps
 import sys
@@ -13,75 +17,209 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from main import app  # The FastAPI application instance
+import dependencies.auth as auth_deps
+from dependencies.auth import get_firebase_user, get_current_session_user, get_current_session_user_with_rbac
+from dependencies.database import get_db
+from dependencies.rbac import RBACUser
+from tests.fakes import FakeFirestore
 
 # The actual default app name used by Firebase Admin SDK
 DEFAULT_APP_NAME_INTERNAL = "[DEFAULT]"
 
-@pytest.fixture(scope="session", autouse=True)
-def setup_firebase_environment():
+# Bearer tokens the tests put in Authorization headers; the auth overrides
+# below map them back to user identities
+ADMIN_USER_ID = "test_admin_user_id"
+REGULAR_USER_ID = "test_user_id"
+ADMIN_TOKEN = "admin-test-token"
+REGULAR_TOKEN = "user-test-token"
+_TOKEN_USER_IDS = {ADMIN_TOKEN: ADMIN_USER_ID, REGULAR_TOKEN: REGULAR_USER_ID}
+
+def pytest_configure(config):
     """
-    Sets up necessary environment variables for Firebase before any app import.
-    This fixture is autouse and session-scoped to run once.
+    Sets up necessary environment variables for Firebase before collection.
+    Runs in every worker process (including xdist workers) ahead of any
+    fixture or app import.
     """
     os.environ["GOOGLE_CLOUD_PROJECT"] = "test-fiji-project-id"
+    # Keep per-request log formatting out of the test hot path; pytest
+    # captures the records anyway, so they only cost CPU.
+    logging.getLogger("uvicorn.access").disabled = True
+    for name in ("services", "fastapi", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
 
 @pytest.fixture(scope="session")
 def mock_firebase_admin_session(session_mocker):
     """
     Mocks firebase_admin components at the session level.
     """
-    session_mocker.patch("firebase_admin.credentials.ApplicationDefault", return_value=MagicMock())
-
     mock_app_instance = MagicMock(spec=firebase_admin.App)
     mock_app_instance.project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
     mock_app_instance.name = DEFAULT_APP_NAME_INTERNAL # Set the name attribute for the mock app
-    
+
     # Mock firebase_admin.initialize_app()
     def _mock_initialize_app(credential=None, options=None, name=DEFAULT_APP_NAME_INTERNAL): # Use the string literal
         if name not in firebase_admin._apps:
              firebase_admin._apps[name] = mock_app_instance
         return firebase_admin._apps[name]
-    session_mocker.patch("firebase_admin.initialize_app", side_effect=_mock_initialize_app)
-    
+
     # Mock firebase_admin.get_app()
     def _mock_get_app(name=DEFAULT_APP_NAME_INTERNAL): # Use the string literal
         if name not in firebase_admin._apps:
             raise ValueError(f"The Firebase app named '{name}' has not been initialized.")
         return firebase_admin._apps[name]
-    session_mocker.patch("firebase_admin.get_app", side_effect=_mock_get_app)
+
+    # One patch.multiple per target module instead of a patch per attribute
+    session_mocker.patch.multiple(
+        "firebase_admin",
+        initialize_app=MagicMock(side_effect=_mock_initialize_app),
+        get_app=MagicMock(side_effect=_mock_get_app),
+    )
+    session_mocker.patch("firebase_admin.credentials.ApplicationDefault", return_value=MagicMock())
 
     mock_firestore_client_instance = MagicMock(spec=firebase_admin.firestore.firestore.Client)
     session_mocker.patch("firebase_admin.firestore.client", return_value=mock_firestore_client_instance)
-    
+
+    # The lifespan builds an AsyncClient for app.state.db; without this patch it
+    # would try to reach real credentials during startup.
+    mock_async_client_instance = MagicMock(name="firestore_async_client")
+    mock_async_client_instance.project = os.getenv("GOOGLE_CLOUD_PROJECT")
+    mock_async_client_instance.close = AsyncMock()
+    session_mocker.patch("main.firestore.AsyncClient", return_value=mock_async_client_instance)
+
     return {
         "firestore_client": mock_firestore_client_instance,
         "app_instance": mock_app_instance
     }
 
-@pytest.fixture(scope="function")
-def db_mock(mock_firebase_admin_session):
+# --- Shared Firestore mock -------------------------------------------------
+
+@pytest.fixture(scope="session")
+def mock_db():
     """
-    Provides the application's Firestore client mock.
+    The Firestore fake served by the get_db override. Session-scoped so the
+    same object backs every request; per-test isolation comes from the
+    autouse reset below.
     """
-    firestore_mock_instance = mock_firebase_admin_session["firestore_client"]
-    firestore_mock_instance.reset_mock(return_value=True, side_effect=True)
-    firebase_admin._apps.clear()
-    return firestore_mock_instance
+    return FakeFirestore()
+
+@pytest.fixture(autouse=True)
+def _reset_mock_db(mock_db):
+    """Resets the shared Firestore fake between tests to preserve isolation."""
+    yield
+    mock_db.reset()
 
 @pytest.fixture(scope="function")
-def client(db_mock): 
+def db_mock(mock_db):
     """
-    Provides a TestClient instance.
+    Provides the application's Firestore fake (sync-test alias of mock_db,
+    pre-reset so configuration from earlier tests cannot leak in).
+    """
+    mock_db.reset()
+    return mock_db
+
+# --- Auth overrides --------------------------------------------------------
+
+def _user_id_from_request(request: Request) -> str:
+    auth_header = request.headers.get("Authorization", "")
+    token = auth_header.removeprefix("Bearer ").strip()
+    return _TOKEN_USER_IDS.get(token, REGULAR_USER_ID)
+
+def _build_rbac_user(user_id: str) -> RBACUser:
+    is_admin = user_id == ADMIN_USER_ID
+    return RBACUser(
+        uid=user_id,
+        email=f"{user_id}@example.com",
+        roles=["sysadmin"] if is_admin else [],
+        privileges={},
+        is_sysadmin=is_admin,
+        first_name="Admin" if is_admin else "Test",
+        last_name="User",
+    )
+
+async def _override_get_firebase_user(request: Request) -> dict:
+    user_id = _user_id_from_request(request)
+    return {"uid": user_id, "email": f"{user_id}@example.com", "name": "Test User"}
+
+async def _override_get_current_session_user(request: Request) -> dict:
+    return {"uid": _user_id_from_request(request), "token_type": "backend_session"}
+
+async def _override_get_current_session_user_with_rbac(request: Request) -> RBACUser:
+    return _build_rbac_user(_user_id_from_request(request))
+
+# require_permission imports these from dependencies.auth at call time rather
+# than through Depends, so app.dependency_overrides alone cannot reach it;
+# the module attributes are patched with token-aware fakes instead.
+async def _fake_get_current_session_user(token=None, db=None) -> dict:
+    return {"uid": _TOKEN_USER_IDS.get(token, REGULAR_USER_ID), "token_type": "backend_session"}
+
+async def _fake_get_current_session_user_with_rbac(session_data=None, db=None) -> RBACUser:
+    return _build_rbac_user((session_data or {}).get("uid", REGULAR_USER_ID))
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_auth_dependencies(mock_db):
+    """
+    Replaces auth and database dependencies for the whole session via
+    app.dependency_overrides (patching module attributes would not affect
+    references FastAPI captured at import time).
+    """
+    app.dependency_overrides[get_db] = lambda: mock_db
+    app.dependency_overrides[get_firebase_user] = _override_get_firebase_user
+    app.dependency_overrides[get_current_session_user] = _override_get_current_session_user
+    app.dependency_overrides[get_current_session_user_with_rbac] = _override_get_current_session_user_with_rbac
+
+    with patch.object(auth_deps, "get_current_session_user", _fake_get_current_session_user), \
+         patch.object(auth_deps, "get_current_session_user_with_rbac", _fake_get_current_session_user_with_rbac):
+        yield
+
+    app.dependency_overrides.clear()
+
+# --- Clients ---------------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def client(mock_firebase_admin_session, mock_auth_dependencies):
+    """
+    Provides a TestClient instance shared across the session.
+
+    Opening a TestClient runs the app's lifespan (Firebase init etc.), so
+    one client is created for the whole run instead of per test; per-test
+    state is handled by the autouse mock reset and by
+    app.dependency_overrides, neither of which needs a fresh client.
     """
     with TestClient(app) as test_client:
         yield test_client
 
-@pytest.fixture(autouse=True, scope="function")
-def mock_auth_dependencies(mocker):
+@pytest.fixture(scope="session")
+def test_client(mock_auth_dependencies):
     """
-    Mocks authentication-related dependencies using relative paths from backend root.
+    Session-scoped httpx AsyncClient over an in-process ASGI transport.
+
+    Built once so the transport and app wiring are amortized across the
+    async test modules. Created outside an event loop on purpose: the
+    ASGI transport holds no loop-bound state, so the client can be driven
+    from each test's own loop, and teardown closes it in a throwaway loop.
     """
-    default_mock_user = {"uid": "test-user-123", "email": "test.user@example.com", "name": "Test User"}
-    
-    mocker.patch("dependencies.auth.get_firebase_user", return_value=default_mock_user)
-    mocker.patch("routers.roles.verify_sysadmin_role", return_value=default_mock_user)
\ No newline at end of file
+    async_client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    yield async_client
+    asyncio.run(async_client.aclose())
+
+# --- Auth tokens -----------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def admin_user_id_token() -> str:
+    """Bearer token the auth overrides resolve to the admin test user."""
+    return ADMIN_TOKEN
+
+@pytest.fixture(scope="session")
+def authenticated_user_id_token() -> str:
+    """Bearer token the auth overrides resolve to the regular test user."""
+    return REGULAR_TOKEN
+
+@pytest.fixture(scope="session")
+def auth_headers(admin_user_id_token) -> dict:
+    """Request headers for the admin test user, built once per session."""
+    return {"Authorization": f"Bearer {admin_user_id_token}"}
+
+@pytest.fixture(scope="session")
+def user_auth_headers(authenticated_user_id_token) -> dict:
+    """Request headers for the regular test user, built once per session."""
+    return {"Authorization": f"Bearer {authenticated_user_id_token}"}
@@ -0,0 +1,201 @@
+"""
+Lightweight hand-written Firestore fakes for the test suite.
+
+Deep MagicMock chains (``mock_db.collection(X).where.return_value.where...``)
+allocate a child mock per attribute access and make every query on a client
+resolve to the same object regardless of collection or filters. These fakes
+replace that with plain attribute access: ``FakeFirestore.collection(name)``
+returns one cached ``FakeCollection`` per name, document references are cached
+per doc ID, and query results are preset per collection (optionally keyed on
+filter values) instead of wired through ``return_value`` chains.
+
+Typical usage::
+
+    events = mock_db.collection("events")
+    events.document("evt_1").get.return_value = mock_event_doc
+    assignments = mock_db.collection("assignments")
+    assignments.set_query_result([mock_assignment_doc], assignableType="event")
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+
+class FakeSnapshotRef:
+    """Reference attached to snapshots: route code only ever awaits
+    delete/update on it, so any other attribute access fails loudly."""
+
+    __slots__ = ("delete", "update")
+
+    def __init__(self):
+        self.delete = AsyncMock()
+        self.update = AsyncMock()
+
+
+class FakeDocSnapshot:
+    """Plain stand-in for DocumentSnapshot.
+
+    Route code only reads ``id``/``exists``/``to_dict()``/``reference``, so a
+    slots class beats a spec'd MagicMock: construction is a few attribute
+    stores, and a typo'd attribute access still raises. ``reference`` stays
+    an AsyncMock so tests can assert on ``reference.delete`` etc.
+    """
+
+    __slots__ = ("id", "exists", "reference", "_data")
+
+    def __init__(self, doc_id, data, exists=True, reference=None):
+        self.id = doc_id
+        self.exists = exists
+        self._data = data
+        self.reference = reference if reference is not None else FakeSnapshotRef()
+
+    def to_dict(self):
+        return self._data
+
+
+def make_doc_snapshot(doc_id, data, exists=True):
+    """Builds a document snapshot with the usual attributes set."""
+    return FakeDocSnapshot(doc_id, data, exists=exists)
+
+
+class FakeDocRef:
+    """Document reference whose I/O methods are AsyncMocks.
+
+    ``get`` resolves to a missing-document snapshot until a test assigns
+    ``get.return_value`` (or ``get.side_effect``).
+    """
+
+    def __init__(self, doc_id: str):
+        self.id = doc_id
+        self.get = AsyncMock(return_value=make_doc_snapshot(doc_id, None, exists=False))
+        self.set = AsyncMock()
+        self.update = AsyncMock()
+        self.delete = AsyncMock()
+
+
+class FakeQuery:
+    """Chainable query that resolves against its collection's preset results.
+
+    Filter values are collected from both the positional and the
+    ``filter=FieldFilter(...)`` forms of ``where``; all other chaining
+    methods are no-ops returning self.
+    """
+
+    def __init__(self, collection: "FakeCollection"):
+        self._collection = collection
+        self._filters = {}
+
+    def where(self, field_path=None, op_string=None, value=None, *, filter=None):
+        if filter is not None:
+            self._filters[str(filter.field_path)] = filter.value
+        elif field_path is not None:
+            self._filters[str(field_path)] = value
+        return self
+
+    def order_by(self, *args, **kwargs):
+        return self
+
+    def limit(self, *args, **kwargs):
+        return self
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def offset(self, *args, **kwargs):
+        return self
+
+    def start_after(self, *args, **kwargs):
+        return self
+
+    def _resolve(self):
+        return self._collection.resolve_query(self._filters)
+
+    def stream(self, *args, **kwargs):
+        return self._aiter()
+
+    async def _aiter(self):
+        for doc in self._resolve():
+            yield doc
+
+    async def get(self, *args, **kwargs):
+        return list(self._resolve())
+
+
+class FakeCollection:
+    """One collection: cached doc refs plus preset query results."""
+
+    def __init__(self, name: str):
+        self.name = name
+        # Docs returned by queries whose filters match no keyed result
+        self.stream_result: list = []
+        # (matcher dict, docs) pairs checked in insertion order
+        self._keyed_results: list = []
+        self._doc_refs: dict = {}
+        # Returned for document() calls without an ID (auto-generated IDs)
+        self._auto_doc_ref = FakeDocRef(f"new_{name}_doc_id")
+
+    def document(self, doc_id=None) -> FakeDocRef:
+        if doc_id is None:
+            return self._auto_doc_ref
+        return self._doc_refs.setdefault(doc_id, FakeDocRef(doc_id))
+
+    def set_query_result(self, docs, **filters):
+        """Preset docs for queries whose where-filters include ``filters``.
+
+        With no filters this is equivalent to assigning ``stream_result``.
+        """
+        if filters:
+            self._keyed_results.append((filters, list(docs)))
+        else:
+            self.stream_result = list(docs)
+
+    def resolve_query(self, query_filters: dict):
+        for matcher, docs in self._keyed_results:
+            if all(query_filters.get(field) == value for field, value in matcher.items()):
+                return docs
+        return self.stream_result
+
+    # Collections support the same query surface as queries
+    def where(self, *args, **kwargs):
+        return FakeQuery(self).where(*args, **kwargs)
+
+    def order_by(self, *args, **kwargs):
+        return FakeQuery(self).order_by(*args, **kwargs)
+
+    def limit(self, *args, **kwargs):
+        return FakeQuery(self).limit(*args, **kwargs)
+
+    def select(self, *args, **kwargs):
+        return FakeQuery(self).select(*args, **kwargs)
+
+    def stream(self, *args, **kwargs):
+        return FakeQuery(self).stream()
+
+    async def get(self, *args, **kwargs):
+        return list(self.resolve_query({}))
+
+
+class FakeFirestore:
+    """Stand-in for firestore.AsyncClient with per-name cached collections."""
+
+    def __init__(self):
+        self.collections: dict = {}
+        self._batch = None
+
+    def collection(self, name: str) -> FakeCollection:
+        return self.collections.setdefault(name, FakeCollection(name))
+
+    async def get_all(self, refs, *args, **kwargs):
+        for ref in refs:
+            yield await ref.get()
+
+    def batch(self):
+        # Cached so tests can assert on the same batch the code under test used
+        if self._batch is None:
+            self._batch = MagicMock(name="write_batch")
+            self._batch.commit = AsyncMock()
+        return self._batch
+
+    def reset(self):
+        """Drops all collections and the batch (per-test isolation)."""
+        self.collections.clear()
+        self._batch = None
@@ -1,558 +1,512 @@
+import orjson
 import pytest
+from fastapi.testclient import TestClient
 from httpx import AsyncClient
-from firebase_admin import firestore
-from unittest.mock import patch, MagicMock, AsyncMock
+from types import MappingProxyType
+from unittest.mock import MagicMock
 import datetime
 
-# Assuming your FastAPI app instance is named `app` in `main.py`
-# from main import app # This might need adjustment based on your project structure
-# For now, direct client usage based on conftest
+from tests.fakes import FakeFirestore, make_doc_snapshot
 
 EVENTS_COLLECTION = "events"
 ASSIGNMENTS_COLLECTION = "assignments"
+WORKING_GROUPS_COLLECTION = "workingGroups"
 USERS_COLLECTION = "users"
 
-# --- New Fixtures for Core Event CRUD ---
-@pytest.fixture
-def mock_event_payload_with_poc():
+# Under pytest-xdist (-n auto --dist loadgroup) this keeps the whole module
+# on one worker, so the session-scoped clients are built once for all nine
+# tests instead of per worker.
+pytestmark = pytest.mark.xdist_group("events")
+
+WG_ID = "wg_cleanup_crew"
+
+# Fixed timestamp for mock document fields, so snapshots are deterministic
+# and fixtures do not re-read the clock per test. Instance times passed to
+# the signup endpoints stay relative (_future) because the routers compare
+# them against the real current time.
+_NOW = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+# Shared read-only payloads; fixtures copy these instead of rebuilding the
+# literals per test
+_BASE_ASSIGNMENT = MappingProxyType({
+    "userId": "test_user_id",
+    "assignableId": "test_event_open",
+    "assignableType": "event",
+    "status": "confirmed",
+    "assignedByUserId": "self_signup",
+    "assignmentDate": _NOW,
+    "createdAt": _NOW,
+    "updatedAt": _NOW,
+})
+
+
+def _future(days=30, hours=0):
+    return datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=days, hours=hours)
+
+
+# The doc fixtures below are read-only in every test, so they are built
+# once per session; tests needing a variant construct their own snapshot
+# (make_doc_snapshot / make_assignment_doc) instead of mutating these.
+
+# --- Fixtures for Core Event CRUD ---
+@pytest.fixture(scope="session")
+def mock_event_payload():
     return {
         "eventName": "Community Cleanup Day",
         "eventType": "Volunteering",
-        "purpose": "Clean up the local park",
         "description": "Join us for a day of cleaning and greening our community park.",
-        "dateTime": (datetime.datetime.utcnow() + datetime.timedelta(days=30)).isoformat(),
-        "endTime": (datetime.datetime.utcnow() + datetime.timedelta(days=30, hours=3)).isoformat(),
+        "dateTime": _future(days=30).isoformat(),
+        "endTime": _future(days=30, hours=3).isoformat(),
         "venue": "Central Park",
         "volunteersRequired": 50,
         "status": "open_for_signup",
         "organizerUserId": "organizer_user_id_123",
         "icon": "eco",
-        "point_of_contact": "Jane Doe - jane.doe@example.com"
+        "workingGroupIds": [WG_ID],
     }
 
-@pytest.fixture
-def mock_created_event_doc_with_poc(mock_event_payload_with_poc):
-    mock_doc = MagicMock()
-    mock_doc.exists = True
+@pytest.fixture(scope="session")
+def mock_event_payload_bytes(mock_event_payload):
+    # Serialized once per session so POST tests reuse the bytes instead of
+    # re-encoding the dict on every request
+    return orjson.dumps(mock_event_payload)
+
+@pytest.fixture(scope="session")
+def mock_created_event_doc(mock_event_payload):
     doc_data = {
-        **mock_event_payload_with_poc,
-        "id": "new_event_with_poc_id",
+        **mock_event_payload,
         "createdByUserId": "test_admin_user_id", # Assuming admin creates it
-        "createdAt": firestore.SERVER_TIMESTAMP, # Placeholder, will be datetime in reality
-        "updatedAt": firestore.SERVER_TIMESTAMP, # Placeholder
+        "createdAt": _NOW,
+        "updatedAt": _NOW,
     }
-    # Convert datetimes back to datetime objects for to_dict if they were ISO strings in payload
+    # Convert ISO strings back to datetime objects, as Firestore would return them
     doc_data["dateTime"] = datetime.datetime.fromisoformat(doc_data["dateTime"])
     doc_data["endTime"] = datetime.datetime.fromisoformat(doc_data["endTime"])
-    
-    mock_doc.to_dict.return_value = doc_data
-    mock_doc.id = "new_event_with_poc_id"
-    return mock_doc
+    return make_doc_snapshot("new_event_id", doc_data)
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def mock_wg_doc():
+    return make_doc_snapshot(WG_ID, {"groupName": "Cleanup Crew", "status": "active"})
+
+@pytest.fixture(scope="session")
 def mock_organizer_user_doc():
-    mock_doc = MagicMock()
-    mock_doc.exists = True
-    mock_doc.to_dict.return_value = {
+    return make_doc_snapshot("organizer_user_id_123", {
         "firstName": "Organizer",
         "lastName": "Person",
         "email": "organizer@example.com",
-    }
-    mock_doc.id = "organizer_user_id_123"
-    return mock_doc
+    })
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_creator_user_doc(): # For the admin user who creates the event
-    mock_doc = MagicMock()
-    mock_doc.exists = True
-    mock_doc.to_dict.return_value = {
+    return make_doc_snapshot("test_admin_user_id", {
         "firstName": "Admin",
         "lastName": "User",
-        "email": "admin@example.com", # Not strictly needed for EventResponse but good for completeness
-    }
-    mock_doc.id = "test_admin_user_id"
-    return mock_doc
+        "email": "admin@example.com",
+    })
 
 
-# --- Existing Fixtures ---
-@pytest.fixture
+# --- Fixtures for signup/assignment tests ---
+@pytest.fixture(scope="session")
 def mock_event_doc_open_for_signup():
-    mock_doc = MagicMock()
-    mock_doc.exists = True
-    mock_doc.to_dict.return_value = {
-        "id": "test_event_open",
+    return make_doc_snapshot("test_event_open", {
         "eventName": "Test Event Open",
         "status": "open_for_signup",
-        "dateTime": datetime.datetime.utcnow() + datetime.timedelta(days=1), 
-        "endTime": datetime.datetime.utcnow() + datetime.timedelta(days=1, hours=2),
+        "dateTime": _future(days=1),
+        "endTime": _future(days=1, hours=2),
         "createdByUserId": "creator_user_id",
-        "point_of_contact": "POC for open event" # Added for consistency
-    }
-    mock_doc.id = "test_event_open"
-    return mock_doc
+        "workingGroupIds": [WG_ID],
+    })
+
+@pytest.fixture(scope="session")
+def mock_wg_membership_doc():
+    # Working-group membership of the regular test user, used by the
+    # authorization checks in the event endpoints
+    return make_doc_snapshot("test_user_wg_membership", {
+        "userId": "test_user_id",
+        "assignableId": WG_ID,
+        "assignableType": "workingGroup",
+        "status": "active",
+    })
 
 @pytest.fixture
-def mock_event_doc_closed_for_signup():
-    mock_doc = MagicMock()
-    mock_doc.exists = True
-    mock_doc.to_dict.return_value = {
-        "id": "test_event_closed",
-        "eventName": "Test Event Closed",
-        "status": "draft", # Not open
-        "dateTime": datetime.datetime.utcnow() + datetime.timedelta(days=1),
-        "endTime": datetime.datetime.utcnow() + datetime.timedelta(days=1, hours=2),
-        "createdByUserId": "creator_user_id",
-        "point_of_contact": "POC for closed event" # Added
-    }
-    mock_doc.id = "test_event_closed"
-    return mock_doc
+def make_assignment_doc():
+    # Factory for assignment snapshots: one _BASE_ASSIGNMENT merge instead
+    # of per-test to_dict() copies patched field by field
+    def _make(doc_id="test_assignment_id", **overrides):
+        return make_doc_snapshot(doc_id, {**_BASE_ASSIGNMENT, **overrides})
+    return _make
 
 @pytest.fixture
-def mock_assignment_doc():
-    mock_doc = MagicMock()
-    mock_doc.exists = True
-    mock_doc.to_dict.return_value = {
-        "id": "test_assignment_id",
-        "userId": "test_user_id",
-        "assignableId": "test_event_open",
-        "assignableType": "event",
-        "status": "confirmed",
-        "assignedByUserId": "self_signup",
-        "assignmentDate": datetime.datetime.utcnow(),
-        "createdAt": datetime.datetime.utcnow(),
-        "updatedAt": datetime.datetime.utcnow(),
-    }
-    mock_doc.id = "test_assignment_id"
-    mock_doc.reference = AsyncMock() # For delete operations
-    return mock_doc
-
-@pytest.fixture
-def mock_user_profile_doc(): # User performing signup / being assigned
-    mock_doc = MagicMock()
-    mock_doc.exists = True
-    mock_doc.to_dict.return_value = {
+def mock_assignment_doc(make_assignment_doc):
+    return make_assignment_doc()
+
+@pytest.fixture(scope="session")
+def mock_user_profile_doc():
+    # User performing signup / being assigned. Session-scoped because every
+    # test reads it as-is; do not mutate it (use make_doc_snapshot for
+    # per-test variants instead).
+    return make_doc_snapshot("test_user_id", {
         "firstName": "Test",
         "lastName": "User",
         "email": "test.user@example.com",
+    })
+
+
+def _signup_body():
+    return {
+        "event_instance_start_date_time": _future(days=1).isoformat(),
+        "event_instance_end_date_time": _future(days=1, hours=2).isoformat(),
     }
-    mock_doc.id = "test_user_id"
-    return mock_doc
 
 
-# --- New Core Event CRUD Tests ---
-@pytest.mark.asyncio
-async def test_create_event_with_poc(
+def _wire_event_read(mock_db, event_doc, organizer_doc, creator_doc, wg_docs=()):
+    """Wires the reads behind an event detail response: the event document,
+    the working-group name lookup and the organizer/creator profiles."""
+    event_data = event_doc.to_dict()
+    mock_db.collection(EVENTS_COLLECTION).document(event_doc.id).get.return_value = event_doc
+    mock_db.collection(WORKING_GROUPS_COLLECTION).stream_result = list(wg_docs)
+    users = mock_db.collection(USERS_COLLECTION)
+    users.document(event_data["organizerUserId"]).get.return_value = organizer_doc
+    users.document(event_data["createdByUserId"]).get.return_value = creator_doc
+
+
+# --- Core Event CRUD Tests ---
+async def test_create_event(
     test_client: AsyncClient,
-    mock_db: MagicMock,
-    admin_user_id_token: str, # Assuming admin creates events
-    mock_event_payload_with_poc: dict,
-    mock_created_event_doc_with_poc: MagicMock,
+    mock_db: FakeFirestore,
+    auth_headers: dict, # Assuming admin creates events
+    mock_event_payload: dict,
+    mock_event_payload_bytes: bytes,
+    mock_created_event_doc: MagicMock,
+    mock_wg_doc: MagicMock,
     mock_organizer_user_doc: MagicMock,
     mock_creator_user_doc: MagicMock
 ):
-    # Mock Firestore calls for creation
-    mock_doc_ref = AsyncMock()
-    mock_doc_ref.set = AsyncMock()
-    mock_doc_ref.get = AsyncMock(return_value=mock_created_event_doc_with_poc)
-    mock_db.collection(EVENTS_COLLECTION).document.return_value = mock_doc_ref
-    
-    # Mock organizer user check
-    mock_db.collection(USERS_COLLECTION).document(mock_event_payload_with_poc["organizerUserId"]).get = AsyncMock(return_value=mock_organizer_user_doc)
-    # Mock creator user details for response
-    mock_db.collection(USERS_COLLECTION).document("test_admin_user_id").get = AsyncMock(return_value=mock_creator_user_doc)
-
-
-    headers = {"Authorization": f"Bearer {admin_user_id_token}"}
-    response = await test_client.post("/events", json=mock_event_payload_with_poc, headers=headers)
-
-    assert response.status_code == 201
+    # Working-group validation reads each referenced WG document
+    mock_db.collection(WORKING_GROUPS_COLLECTION).document(WG_ID).get.return_value = mock_wg_doc
+
+    # Creation goes through an auto-ID document reference
+    mock_doc_ref = mock_db.collection(EVENTS_COLLECTION).document()
+    mock_doc_ref.get.return_value = mock_created_event_doc
+
+    # Organizer check plus creator details for the response
+    _wire_event_read(mock_db, mock_created_event_doc, mock_organizer_user_doc, mock_creator_user_doc)
+
+    headers = {**auth_headers, "content-type": "application/json"}
+    response = await test_client.post("/events", content=mock_event_payload_bytes, headers=headers)
+
+    assert response.status_code == 201, response.json()
     response_data = response.json()
-    assert response_data["eventName"] == mock_event_payload_with_poc["eventName"]
-    assert response_data["point_of_contact"] == mock_event_payload_with_poc["point_of_contact"]
-    assert response_data["organizerUserId"] == mock_event_payload_with_poc["organizerUserId"]
+    assert response_data["eventName"] == mock_event_payload["eventName"]
+    assert response_data["organizerUserId"] == mock_event_payload["organizerUserId"]
     assert response_data["organizerFirstName"] == "Organizer"
     assert response_data["creatorFirstName"] == "Admin"
-    mock_doc_ref.set.assert_called_once()
+    assert response_data["workingGroupNames"] == ["Cleanup Crew"]
+    mock_doc_ref.set.assert_awaited_once()
 
 
-@pytest.mark.asyncio
-async def test_get_event_with_poc(
+async def test_get_event(
     test_client: AsyncClient,
-    mock_db: MagicMock,
-    authenticated_user_id_token: str, # Any authenticated user can get
-    mock_created_event_doc_with_poc: MagicMock, # Use the same doc as if it was created
+    mock_db: FakeFirestore,
+    user_auth_headers: dict, # Any authorized member can get
+    mock_created_event_doc: MagicMock,
+    mock_wg_doc: MagicMock,
+    mock_wg_membership_doc: MagicMock,
     mock_organizer_user_doc: MagicMock,
     mock_creator_user_doc: MagicMock
 ):
-    event_id = mock_created_event_doc_with_poc.id
-    
-    # Mock Firestore get for the event
-    mock_db.collection(EVENTS_COLLECTION).document(event_id).get = AsyncMock(return_value=mock_created_event_doc_with_poc)
-    
-    # Mock user details for organizer and creator
-    event_dict = mock_created_event_doc_with_poc.to_dict()
-    mock_db.collection(USERS_COLLECTION).document(event_dict["organizerUserId"]).get = AsyncMock(return_value=mock_organizer_user_doc)
-    mock_db.collection(USERS_COLLECTION).document(event_dict["createdByUserId"]).get = AsyncMock(return_value=mock_creator_user_doc)
-
-    # Mock assignment check for EventWithSignupStatus (assume no signup for simplicity here)
-    mock_assignment_query = AsyncMock()
-    mock_assignment_query.stream = AsyncMock(return_value=[]) # No assignment
-    mock_db.collection(ASSIGNMENTS_COLLECTION).where.return_value.where.return_value.where.return_value.limit.return_value = mock_assignment_query
-    
-    headers = {"Authorization": f"Bearer {authenticated_user_id_token}"}
-    response = await test_client.get(f"/events/{event_id}", headers=headers)
-
-    assert response.status_code == 200
+    event_id = mock_created_event_doc.id
+    event_dict = mock_created_event_doc.to_dict()
+
+    _wire_event_read(
+        mock_db, mock_created_event_doc, mock_organizer_user_doc, mock_creator_user_doc,
+        wg_docs=[mock_wg_doc],
+    )
+
+    # The regular user is authorized through their working-group membership;
+    # the signup-status query (assignableType == "event") finds nothing
+    mock_db.collection(ASSIGNMENTS_COLLECTION).set_query_result(
+        [mock_wg_membership_doc], assignableType="workingGroup"
+    )
+
+    response = await test_client.get(f"/events/{event_id}", headers=user_auth_headers)
+
+    assert response.status_code == 200, response.json()
     response_data = response.json()
     assert response_data["id"] == event_id
     assert response_data["eventName"] == event_dict["eventName"]
-    assert response_data["point_of_contact"] == event_dict["point_of_contact"]
-    assert response_data["isCurrentUserSignedUp"] is None # Or False, depending on how None is handled vs empty stream
+    assert response_data["workingGroupNames"] == ["Cleanup Crew"]
+    assert response_data["isCurrentUserSignedUp"] is None
 
-@pytest.mark.asyncio
-async def test_update_event_with_poc(
+async def test_update_event(
     test_client: AsyncClient,
-    mock_db: MagicMock,
-    admin_user_id_token: str, # Assuming admin updates events
-    mock_created_event_doc_with_poc: MagicMock, # Existing event
+    mock_db: FakeFirestore,
+    auth_headers: dict, # Assuming admin updates events
+    mock_created_event_doc: MagicMock, # Existing event
+    mock_wg_doc: MagicMock,
     mock_organizer_user_doc: MagicMock,
     mock_creator_user_doc: MagicMock
 ):
-    event_id = mock_created_event_doc_with_poc.id
+    event_id = mock_created_event_doc.id
     update_payload = {
         "eventName": "Updated Community Cleanup Day",
-        "point_of_contact": "John Smith - john.smith@example.com",
         "status": "draft"
     }
 
-    # Mock get current event
-    mock_event_ref = AsyncMock()
-    mock_event_ref.get = AsyncMock(return_value=mock_created_event_doc_with_poc) # Initial get
-    mock_event_ref.update = AsyncMock() # For the update call
-    
-    # Simulate the state after update for the second get
-    updated_event_data = mock_created_event_doc_with_poc.to_dict().copy()
-    updated_event_data.update(update_payload)
-    updated_event_data["updatedAt"] = datetime.datetime.utcnow() # Simulate update
-    
-    mock_updated_doc = MagicMock()
-    mock_updated_doc.exists = True
-    mock_updated_doc.to_dict.return_value = updated_event_data
-    mock_updated_doc.id = event_id
-    
-    # Chain the get calls: first for existing, second for after update
-    mock_event_ref.get.side_effect = [
-        AsyncMock(return_value=mock_created_event_doc_with_poc), # First get() in endpoint
-        AsyncMock(return_value=mock_updated_doc) # Second get() after update
-    ]
-    mock_db.collection(EVENTS_COLLECTION).document(event_id).get = mock_event_ref.get # Assign the side_effect mock
-    mock_db.collection(EVENTS_COLLECTION).document(event_id).update = mock_event_ref.update
-
-
-    # Mock user details for response (organizer might change, creator stays same)
-    mock_db.collection(USERS_COLLECTION).document(updated_event_data["organizerUserId"]).get = AsyncMock(return_value=mock_organizer_user_doc)
-    mock_db.collection(USERS_COLLECTION).document(updated_event_data["createdByUserId"]).get = AsyncMock(return_value=mock_creator_user_doc)
-
-    headers = {"Authorization": f"Bearer {admin_user_id_token}"}
-    response = await test_client.put(f"/events/{event_id}", json=update_payload, headers=headers)
-
-    assert response.status_code == 200
-    response_data = response.json()
-    assert response_data["eventName"] == update_payload["eventName"]
-    assert response_data["point_of_contact"] == update_payload["point_of_contact"]
-    assert response_data["status"] == update_payload["status"]
-    
-    mock_event_ref.update.assert_called_once()
-    # More precise check for what was updated:
-    # called_update_data = mock_event_ref.update.call_args[0][0]
-    # assert called_update_data["point_of_contact"] == update_payload["point_of_contact"]
-    # assert "updatedAt" in called_update_data
-
+    # The endpoint builds its response from the merged local state, so only
+    # the initial read needs wiring
+    _wire_event_read(
+        mock_db, mock_created_event_doc, mock_organizer_user_doc, mock_creator_user_doc,
+        wg_docs=[mock_wg_doc],
+    )
+    mock_event_ref = mock_db.collection(EVENTS_COLLECTION).document(event_id)
 
-# --- Existing Signup/Assignment Tests (modified slightly for datetime and POC consistency) ---
-
-@pytest.mark.asyncio
-async def test_self_signup_for_event_success(
-    test_client: AsyncClient,
-    mock_db: MagicMock,
-    authenticated_user_id_token: str, 
-    mock_event_doc_open_for_signup: MagicMock,
-    mock_user_profile_doc: MagicMock
-):
-    event_id = "test_event_open"
+    response = await test_client.put(f"/events/{event_id}", json=update_payload, headers=auth_headers)
 
-    mock_db.collection(EVENTS_COLLECTION).document(event_id).get = AsyncMock(return_value=mock_event_doc_open_for_signup)
-    
-    mock_existing_assignment_query = AsyncMock()
-    mock_existing_assignment_query.stream = AsyncMock(return_value=[]) 
-    mock_db.collection(ASSIGNMENTS_COLLECTION).where.return_value.where.return_value.where.return_value.limit.return_value = mock_existing_assignment_query
-    
-    mock_new_assignment_ref = AsyncMock()
-    mock_new_assignment_doc = AsyncMock()
-    mock_new_assignment_doc.exists = True
-    mock_new_assignment_doc.id = "new_assignment_id"
-    # Ensure datetime objects for response model compatibility
-    current_time = datetime.datetime.utcnow()
-    mock_new_assignment_doc.to_dict.return_value = {
-        "userId": "test_user_id", 
-        "assignableId": event_id,
-        "assignableType": "event",
-        "status": "confirmed",
-        "assignedByUserId": "self_signup",
-        "assignmentDate": current_time, 
-        "createdAt": current_time,
-        "updatedAt": current_time,
-    }
-    mock_new_assignment_ref.get = AsyncMock(return_value=mock_new_assignment_doc)
-    mock_db.collection(ASSIGNMENTS_COLLECTION).document.return_value = mock_new_assignment_ref
-    
-    mock_db.collection(USERS_COLLECTION).document("test_user_id").get = AsyncMock(return_value=mock_user_profile_doc)
-
-    headers = {"Authorization": f"Bearer {authenticated_user_id_token}"}
-    response = await test_client.post(f"/events/{event_id}/signup", headers=headers)
-
-    assert response.status_code == 201
+    assert response.status_code == 200, response.json()
     response_data = response.json()
-    assert response_data["assignableId"] == event_id
-    assert response_data["userId"] == "test_user_id"
-    assert response_data["status"] == "confirmed"
-    assert response_data["userFirstName"] == "Test"
-
-@pytest.mark.asyncio
-async def test_self_signup_for_event_not_open(
-    test_client: AsyncClient,
-    mock_db: MagicMock,
-    authenticated_user_id_token: str,
-    mock_event_doc_closed_for_signup: MagicMock
-):
-    event_id = "test_event_closed"
-    mock_db.collection(EVENTS_COLLECTION).document(event_id).get = AsyncMock(return_value=mock_event_doc_closed_for_signup)
+    assert response_data["eventName"] == update_payload["eventName"]
+    assert response_data["status"] == update_payload["status"]
 
-    headers = {"Authorization": f"Bearer {authenticated_user_id_token}"}
-    response = await test_client.post(f"/events/{event_id}/signup", headers=headers)
+    mock_event_ref.update.assert_awaited_once()
+    called_update_data = mock_event_ref.update.call_args[0][0]
+    assert called_update_data["eventName"] == update_payload["eventName"]
+    assert "updatedAt" in called_update_data
 
-    assert response.status_code == 400
-    assert "not open for signups" in response.json()["detail"]
 
-@pytest.mark.asyncio
-async def test_self_signup_for_event_already_signed_up(
-    test_client: AsyncClient,
-    mock_db: MagicMock,
-    authenticated_user_id_token: str,
-    mock_event_doc_open_for_signup: MagicMock,
-    mock_assignment_doc: MagicMock 
+# --- Signup Tests ---
+
+def _wire_signup_mocks(mock_db, event_doc, wg_membership_doc, existing_assignments):
+    """Shared mock wiring for the parametrized signup/withdraw tests."""
+    mock_db.collection(EVENTS_COLLECTION).document(event_doc.id).get.return_value = event_doc
+
+    # Authorization resolves through working-group membership; the event
+    # assignment query sees whatever the case preset
+    assignments = mock_db.collection(ASSIGNMENTS_COLLECTION)
+    assignments.set_query_result([wg_membership_doc], assignableType="workingGroup")
+    assignments.set_query_result(existing_assignments, assignableType="event")
+    return assignments
+
+
+# These tests only exercise handler logic, so they go through the shared
+# sync TestClient (one event loop for the whole session) instead of paying
+# for an httpx AsyncClient round-trip per request.
+@pytest.mark.parametrize(
+    "event_status, already_signed_up, expected_status, expected_detail",
+    [
+        pytest.param("open_for_signup", False, 201, None, id="success"),
+        pytest.param("cancelled", False, 400, "cancelled", id="cancelled"),
+        pytest.param("open_for_signup", True, 409, "already signed up", id="already-signed-up"),
+    ],
+)
+def test_self_signup_for_event(
+    client: TestClient,
+    mock_db: FakeFirestore,
+    user_auth_headers: dict,
+    mock_wg_membership_doc: MagicMock,
+    make_assignment_doc,
+    mock_user_profile_doc: MagicMock,
+    event_status: str,
+    already_signed_up: bool,
+    expected_status: int,
+    expected_detail: str,
 ):
-    event_id = "test_event_open"
-    mock_db.collection(EVENTS_COLLECTION).document(event_id).get = AsyncMock(return_value=mock_event_doc_open_for_signup)
-
-    mock_existing_assignment_query = AsyncMock()
-    mock_existing_assignment_query.stream = AsyncMock(return_value=[mock_assignment_doc]) 
-    mock_db.collection(ASSIGNMENTS_COLLECTION).where.return_value.where.return_value.where.return_value.limit.return_value = mock_existing_assignment_query
-
-    headers = {"Authorization": f"Bearer {authenticated_user_id_token}"}
-    response = await test_client.post(f"/events/{event_id}/signup", headers=headers)
-
-    assert response.status_code == 409
-    assert "already signed up" in response.json()["detail"]
-
-@pytest.mark.asyncio
-async def test_withdraw_event_signup_success(
-    test_client: AsyncClient,
-    mock_db: MagicMock,
-    authenticated_user_id_token: str,
-    mock_assignment_doc: MagicMock 
+    event_id = "test_event_signup"
+    event_doc = make_doc_snapshot(event_id, {
+        "eventName": "Test Event Signup",
+        "status": event_status,
+        "dateTime": _future(days=1),
+        "endTime": _future(days=1, hours=2),
+        "createdByUserId": "creator_user_id",
+        "workingGroupIds": [WG_ID],
+    })
+    assignments = _wire_signup_mocks(
+        mock_db, event_doc, mock_wg_membership_doc,
+        [make_assignment_doc(assignableId=event_id)] if already_signed_up else [],
+    )
+
+    mock_new_assignment_ref = assignments.document()
+    mock_new_assignment_ref.get.return_value = make_assignment_doc(
+        "new_assignment_id", assignableId=event_id
+    )
+
+    mock_db.collection(USERS_COLLECTION).document("test_user_id").get.return_value = mock_user_profile_doc
+
+    response = client.post(f"/events/{event_id}/signup", json=_signup_body(), headers=user_auth_headers)
+
+    assert response.status_code == expected_status, response.json()
+    if expected_detail is not None:
+        assert expected_detail in response.json()["detail"]
+        mock_new_assignment_ref.set.assert_not_awaited()
+    else:
+        response_data = response.json()
+        assert response_data["assignableId"] == event_id
+        assert response_data["userId"] == "test_user_id"
+        assert response_data["status"] == "confirmed"
+        assert response_data["userFirstName"] == "Test"
+        mock_new_assignment_ref.set.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    "signup_exists, expected_status, expected_detail",
+    [
+        pytest.param(True, 204, None, id="success"),
+        pytest.param(False, 404, "Signup not found", id="not-found"),
+    ],
+)
+def test_withdraw_event_signup(
+    client: TestClient,
+    mock_db: FakeFirestore,
+    user_auth_headers: dict,
+    mock_assignment_doc: MagicMock,
+    signup_exists: bool,
+    expected_status: int,
+    expected_detail: str,
 ):
     event_id = mock_assignment_doc.to_dict()["assignableId"]
-    
-    mock_existing_assignment_query = AsyncMock()
-    mock_existing_assignment_query.stream = AsyncMock(return_value=[mock_assignment_doc])
-    mock_db.collection(ASSIGNMENTS_COLLECTION).where.return_value.where.return_value.where.return_value.limit.return_value = mock_existing_assignment_query
-
-    headers = {"Authorization": f"Bearer {authenticated_user_id_token}"}
-    response = await test_client.delete(f"/events/{event_id}/signup", headers=headers)
 
-    assert response.status_code == 204
-    mock_assignment_doc.reference.delete.assert_called_once()
-
-@pytest.mark.asyncio
-async def test_withdraw_event_signup_not_found(
-    test_client: AsyncClient,
-    mock_db: MagicMock,
-    authenticated_user_id_token: str
-):
-    event_id = "test_event_non_existent_signup"
-    
-    mock_existing_assignment_query = AsyncMock()
-    mock_existing_assignment_query.stream = AsyncMock(return_value=[]) 
-    mock_db.collection(ASSIGNMENTS_COLLECTION).where.return_value.where.return_value.where.return_value.limit.return_value = mock_existing_assignment_query
+    mock_db.collection(ASSIGNMENTS_COLLECTION).set_query_result(
+        [mock_assignment_doc] if signup_exists else [], assignableType="event"
+    )
 
-    headers = {"Authorization": f"Bearer {authenticated_user_id_token}"}
-    response = await test_client.delete(f"/events/{event_id}/signup", headers=headers)
+    response = client.delete(
+        f"/events/{event_id}/signup",
+        params={"event_instance_start_date_time": _future(days=1).isoformat()},
+        headers=user_auth_headers,
+    )
 
-    assert response.status_code == 404
-    assert "Signup not found" in response.json()["detail"]
+    assert response.status_code == expected_status
+    if expected_detail is not None:
+        assert expected_detail in response.json()["detail"]
+        mock_assignment_doc.reference.delete.assert_not_awaited()
+    else:
+        mock_assignment_doc.reference.delete.assert_awaited_once()
 
 # --- Admin Assignment Tests ---
 
-@pytest.mark.asyncio
 async def test_admin_list_event_assignments(
     test_client: AsyncClient,
-    mock_db: MagicMock,
-    admin_user_id_token: str, 
+    mock_db: FakeFirestore,
+    auth_headers: dict,
     mock_event_doc_open_for_signup: MagicMock,
     mock_assignment_doc: MagicMock,
     mock_user_profile_doc: MagicMock
 ):
     event_id = "test_event_open"
-    mock_db.collection(EVENTS_COLLECTION).document(event_id).get = AsyncMock(return_value=mock_event_doc_open_for_signup)
+    mock_db.collection(EVENTS_COLLECTION).document(event_id).get.return_value = mock_event_doc_open_for_signup
+
+    mock_db.collection(ASSIGNMENTS_COLLECTION).set_query_result(
+        [mock_assignment_doc], assignableId=event_id, assignableType="event"
+    )
 
-    mock_assignments_query = AsyncMock()
     assignment_data = mock_assignment_doc.to_dict()
-    assignment_data["assignableId"] = event_id 
-    mock_assignment_doc_for_event = MagicMock()
-    mock_assignment_doc_for_event.exists = True
-    mock_assignment_doc_for_event.to_dict.return_value = assignment_data
-    mock_assignment_doc_for_event.id = assignment_data["id"]
-    
-    mock_assignments_query.stream = AsyncMock(return_value=[mock_assignment_doc_for_event])
-    mock_db.collection(ASSIGNMENTS_COLLECTION).where.return_value.where.return_value = mock_assignments_query
-    
-    mock_db.collection(USERS_COLLECTION).document(assignment_data["userId"]).get = AsyncMock(return_value=mock_user_profile_doc)
-
-    headers = {"Authorization": f"Bearer {admin_user_id_token}"}
-    response = await test_client.get(f"/events/{event_id}/assignments", headers=headers)
-
-    assert response.status_code == 200
+    mock_db.collection(USERS_COLLECTION).document(assignment_data["userId"]).get.return_value = mock_user_profile_doc
+
+    response = await test_client.get(f"/events/{event_id}/assignments", headers=auth_headers)
+
+    assert response.status_code == 200, response.json()
     response_data = response.json()
     assert len(response_data) == 1
-    assert response_data[0]["id"] == assignment_data["id"]
+    assert response_data[0]["id"] == mock_assignment_doc.id
     assert response_data[0]["userId"] == assignment_data["userId"]
     assert response_data[0]["userFirstName"] == "Test"
 
 
-@pytest.mark.asyncio
 async def test_admin_create_event_assignment_success(
     test_client: AsyncClient,
-    mock_db: MagicMock,
-    admin_user_id_token: str,
+    mock_db: FakeFirestore,
+    auth_headers: dict,
     mock_event_doc_open_for_signup: MagicMock,
+    make_assignment_doc,
 ):
     event_id = "test_event_open"
     user_to_assign_id = "user_to_be_assigned_id"
 
-    mock_db.collection(EVENTS_COLLECTION).document(event_id).get = AsyncMock(return_value=mock_event_doc_open_for_signup)
-    
-    user_to_assign_profile_doc = MagicMock()
-    user_to_assign_profile_doc.exists = True
-    user_to_assign_profile_doc.to_dict.return_value = {"firstName": "Assigned", "lastName": "User", "email":"assigned@example.com"}
-    mock_db.collection(USERS_COLLECTION).document(user_to_assign_id).get = AsyncMock(return_value=user_to_assign_profile_doc)
-
-    mock_existing_assignment_query = AsyncMock()
-    mock_existing_assignment_query.stream = AsyncMock(return_value=[])
-    mock_db.collection(ASSIGNMENTS_COLLECTION).where.return_value.where.return_value.where.return_value.limit.return_value = mock_existing_assignment_query
-
-    mock_new_assignment_ref = AsyncMock()
-    mock_new_assignment_doc = AsyncMock()
-    mock_new_assignment_doc.exists = True
-    mock_new_assignment_doc.id = "new_admin_assignment_id"
-    current_time = datetime.datetime.utcnow()
-    mock_new_assignment_doc.to_dict.return_value = {
-        "userId": user_to_assign_id,
-        "assignableId": event_id,
-        "assignableType": "event",
-        "status": "confirmed_admin",
-        "assignedByUserId": "test_admin_user_id", 
-        "assignmentDate": current_time,
-        "createdAt": current_time,
-        "updatedAt": current_time,
-    }
-    mock_new_assignment_ref.get = AsyncMock(return_value=mock_new_assignment_doc)
-    mock_db.collection(ASSIGNMENTS_COLLECTION).document.return_value = mock_new_assignment_ref
+    mock_db.collection(EVENTS_COLLECTION).document(event_id).get.return_value = mock_event_doc_open_for_signup
+
+    user_to_assign_profile_doc = make_doc_snapshot(user_to_assign_id, {
+        "firstName": "Assigned", "lastName": "User", "email": "assigned@example.com"
+    })
+    mock_db.collection(USERS_COLLECTION).document(user_to_assign_id).get.return_value = user_to_assign_profile_doc
+
+    # No conflicting assignment for the instance
+    assignments = mock_db.collection(ASSIGNMENTS_COLLECTION)
+    assignments.set_query_result([], assignableType="event")
+
+    mock_new_assignment_ref = assignments.document()
+    mock_new_assignment_ref.get.return_value = make_assignment_doc(
+        "new_admin_assignment_id",
+        userId=user_to_assign_id,
+        assignableId=event_id,
+        status="confirmed_admin",
+        assignedByUserId="test_admin_user_id",
+    )
 
     assignment_payload = {
         "userId": user_to_assign_id,
-        "assignableId": event_id, 
+        "assignableId": event_id,
         "assignableType": "event",
         "status": "confirmed_admin"
     }
-    headers = {"Authorization": f"Bearer {admin_user_id_token}"}
-    response = await test_client.post(f"/events/{event_id}/assignments", json=assignment_payload, headers=headers)
+    response = await test_client.post(f"/events/{event_id}/assignments", json=assignment_payload, headers=auth_headers)
 
-    assert response.status_code == 201
+    assert response.status_code == 201, response.json()
     response_data = response.json()
     assert response_data["userId"] == user_to_assign_id
     assert response_data["assignableId"] == event_id
     assert response_data["status"] == "confirmed_admin"
     assert response_data["userFirstName"] == "Assigned"
+    mock_new_assignment_ref.set.assert_awaited_once()
 
 
-@pytest.mark.asyncio
 async def test_admin_update_event_assignment_success(
     test_client: AsyncClient,
-    mock_db: MagicMock,
-    admin_user_id_token: str,
-    mock_assignment_doc: MagicMock, 
-    mock_user_profile_doc: MagicMock 
+    mock_db: FakeFirestore,
+    auth_headers: dict,
+    mock_assignment_doc: MagicMock,
+    make_assignment_doc,
+    mock_user_profile_doc: MagicMock
 ):
-    event_id = mock_assignment_doc.to_dict()["assignableId"]
+    assignment_data = mock_assignment_doc.to_dict()
+    event_id = assignment_data["assignableId"]
     assignment_id = mock_assignment_doc.id
-    
-    # Mock fetching the existing assignment for validation and update
-    mock_assignment_get_ref = AsyncMock()
-    mock_assignment_get_ref.get = AsyncMock(return_value=mock_assignment_doc) # Initial get
-    mock_assignment_get_ref.update = AsyncMock() # For the update call
-    
-    # Simulate the state after update for the second get in the endpoint
-    updated_assignment_data = mock_assignment_doc.to_dict().copy()
-    updated_assignment_data.update({"status": "attended", "hoursContributed": 2.5, "updatedAt": datetime.datetime.utcnow()})
-    
-    mock_updated_assignment_doc_after_put = MagicMock()
-    mock_updated_assignment_doc_after_put.exists = True
-    mock_updated_assignment_doc_after_put.to_dict.return_value = updated_assignment_data
-    mock_updated_assignment_doc_after_put.id = assignment_id
-    
-    # Chain the get calls: first for existing, second for after update
-    mock_assignment_get_ref.get.side_effect = [
-        AsyncMock(return_value=mock_assignment_doc), 
-        AsyncMock(return_value=mock_updated_assignment_doc_after_put)
-    ]
-    
-    mock_db.collection(ASSIGNMENTS_COLLECTION).document(assignment_id).get = mock_assignment_get_ref.get
-    mock_db.collection(ASSIGNMENTS_COLLECTION).document(assignment_id).update = mock_assignment_get_ref.update
-    
-    mock_db.collection(USERS_COLLECTION).document(mock_assignment_doc.to_dict()["userId"]).get = AsyncMock(return_value=mock_user_profile_doc)
-
-    update_payload = {"status": "attended", "hoursContributed": 2.5}
-    headers = {"Authorization": f"Bearer {admin_user_id_token}"}
-    response = await test_client.put(f"/events/{event_id}/assignments/{assignment_id}", json=update_payload, headers=headers)
-
-    assert response.status_code == 200
+
+    # The endpoint responds from the merged local state; only the initial
+    # read needs wiring
+    mock_assignment_ref = mock_db.collection(ASSIGNMENTS_COLLECTION).document(assignment_id)
+    mock_assignment_ref.get.return_value = mock_assignment_doc
+
+    mock_db.collection(USERS_COLLECTION).document(assignment_data["userId"]).get.return_value = mock_user_profile_doc
+
+    update_payload = {"status": "attended", "notes": "Great work"}
+    response = await test_client.put(f"/events/{event_id}/assignments/{assignment_id}", json=update_payload, headers=auth_headers)
+
+    assert response.status_code == 200, response.json()
     response_data = response.json()
     assert response_data["status"] == "attended"
-    assert response_data["hoursContributed"] == 2.5
+    assert response_data["notes"] == "Great work"
     assert response_data["userFirstName"] == "Test"
-    
-    mock_assignment_get_ref.update.assert_called_once()
-    called_update_data = mock_assignment_get_ref.update.call_args[0][0]
+
+    mock_assignment_ref.update.assert_awaited_once()
+    called_update_data = mock_assignment_ref.update.call_args[0][0]
     assert called_update_data["status"] == "attended"
-    assert called_update_data["hoursContributed"] == 2.5
+    assert called_update_data["notes"] == "Great work"
     assert "updatedAt" in called_update_data
 
 
-@pytest.mark.asyncio
 async def test_admin_delete_event_assignment_success(
     test_client: AsyncClient,
-    mock_db: MagicMock,
-    admin_user_id_token: str,
-    mock_assignment_doc: MagicMock 
+    mock_db: FakeFirestore,
+    auth_headers: dict,
+    mock_assignment_doc: MagicMock
 ):
     event_id = mock_assignment_doc.to_dict()["assignableId"]
     assignment_id = mock_assignment_doc.id
 
-    mock_db.collection(ASSIGNMENTS_COLLECTION).document(assignment_id).get = AsyncMock(return_value=mock_assignment_doc)
+    mock_assignment_ref = mock_db.collection(ASSIGNMENTS_COLLECTION).document(assignment_id)
+    mock_assignment_ref.get.return_value = mock_assignment_doc
 
-    headers = {"Authorization": f"Bearer {admin_user_id_token}"}
-    response = await test_client.delete(f"/events/{event_id}/assignments/{assignment_id}", headers=headers)
+    response = await test_client.delete(f"/events/{event_id}/assignments/{assignment_id}", headers=auth_headers)
 
     assert response.status_code == 204
-    mock_assignment_doc.reference.delete.assert_called_once()
+    mock_assignment_ref.delete.assert_awaited_once()
@@ -22,14 +22,14 @@ def test_health_check_success(client: TestClient, db_mock):
     
     response = client.get("/health")
     assert response.status_code == status.HTTP_200_OK
-    
+
     expected_project_id = "test-fiji-project-id" # As set in conftest.py
-    expected_response = {
-        "status": "ok",
-        "message": "Backend is running, Firebase Admin SDK and Firestore client are initialized.",
-        "project_id": expected_project_id
-    }
-    assert response.json() == expected_response
+    response_json = response.json()
+    assert response_json["status"] == "ok"
+    assert response_json["firebase_sdk_initialized"] is True
+    assert response_json["firestore_client_initialized"] is True
+    assert response_json["effective_project_id_from_sdk"] == expected_project_id
+    assert response_json["firestore_client_project_id"] == expected_project_id
 
     # Verify that firestore.client() was called during app startup (lifespan)
     # The actual db_mock is what firebase_admin.firestore.client is patched to return.
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
 import os
 import sys
 from google.cloud import firestore
@@ -40,7 +41,7 @@ def initialize_firestore_client():
         else:
             print(f"Firebase Admin SDK already initialized for project: {firebase_admin.get_app().project_id}.")
 
-        db = firestore.Client(project=project_id) # Using synchronous client for a script
+        db = firestore.AsyncClient(project=project_id) # Async so the batched lookups can run concurrently
         print("Firestore client initialized successfully.")
         return db
     except ValueError as ve:
@@ -50,7 +51,7 @@ def initialize_firestore_client():
         print(f"Error initializing Firestore: {e}", file=sys.stderr)
         sys.exit(1)
 
-def cleanup_orphan_assignments(db: firestore.Client, dry_run: bool = True):
+async def cleanup_orphan_assignments(db: firestore.AsyncClient, dry_run: bool = True):
     """
     Finds and optionally deletes orphaned assignments.
     An assignment is orphaned if its referenced assignableId (event or working group) does not exist.
@@ -59,13 +60,23 @@ def cleanup_orphan_assignments(db: firestore.Client, dry_run: bool = True):
     
     orphaned_count = 0
     deleted_count = 0
-    
+
+    PARENT_COLLECTIONS = {
+        "event": EVENTS_COLLECTION,
+        "workingGroup": WORKING_GROUPS_COLLECTION,
+    }
+    GET_ALL_CHUNK_SIZE = 100
+
     assignments_ref = db.collection(ASSIGNMENTS_COLLECTION)
-    assignments_stream = assignments_ref.stream() # Using stream for potentially large collections
 
-    orphans_to_delete_refs = []
+    # First pass: cache the assignments and collect the unique parent IDs per
+    # type. Many assignments share a parent, so checking existence per unique
+    # ID with batched get_all calls replaces one get() round-trip per
+    # assignment with ceil(unique parents / chunk) RPCs.
+    cached_assignments = []
+    parent_ids_by_type = {assignable_type: set() for assignable_type in PARENT_COLLECTIONS}
 
-    for assignment_doc in assignments_stream:
+    async for assignment_doc in assignments_ref.stream():
         assignment_data = assignment_doc.to_dict()
         assignment_id = assignment_doc.id
         assignable_id = assignment_data.get("assignableId")
@@ -74,30 +85,46 @@ def cleanup_orphan_assignments(db: firestore.Client, dry_run: bool = True):
         if not assignable_id or not assignable_type:
             print(f"  [SKIPPING] Assignment {assignment_id} is missing assignableId or assignableType.")
             continue
-
-        parent_collection_name = None
-        if assignable_type == "event":
-            parent_collection_name = EVENTS_COLLECTION
-        elif assignable_type == "workingGroup":
-            parent_collection_name = WORKING_GROUPS_COLLECTION
-        else:
+        if assignable_type not in PARENT_COLLECTIONS:
             print(f"  [SKIPPING] Assignment {assignment_id} has unknown assignableType: {assignable_type}.")
             continue
-            
-        parent_doc_ref = db.collection(parent_collection_name).document(assignable_id)
-        parent_doc = parent_doc_ref.get()
 
-        if not parent_doc.exists:
+        parent_ids_by_type[assignable_type].add(assignable_id)
+        cached_assignments.append((assignment_doc, assignment_data))
+
+    async def fetch_existing_ids(assignable_type, chunk_refs):
+        # Only existence matters here; a __name__ field mask keeps the
+        # parent documents' payloads off the wire entirely.
+        return [
+            (assignable_type, parent_doc.id)
+            async for parent_doc in db.get_all(chunk_refs, field_paths=["__name__"])
+            if parent_doc.exists
+        ]
+
+    lookup_tasks = []
+    for assignable_type, parent_ids in parent_ids_by_type.items():
+        parent_collection = db.collection(PARENT_COLLECTIONS[assignable_type])
+        unique_ids = sorted(parent_ids)
+        for i in range(0, len(unique_ids), GET_ALL_CHUNK_SIZE):
+            chunk_refs = [parent_collection.document(parent_id) for parent_id in unique_ids[i:i + GET_ALL_CHUNK_SIZE]]
+            lookup_tasks.append(fetch_existing_ids(assignable_type, chunk_refs))
+
+    existing_parent_ids = set()
+    for chunk_result in await asyncio.gather(*lookup_tasks):
+        existing_parent_ids.update(chunk_result)
+
+    orphans_to_delete_refs = []
+    for assignment_doc, assignment_data in cached_assignments:
+        assignable_id = assignment_data["assignableId"]
+        assignable_type = assignment_data["assignableType"]
+
+        if (assignable_type, assignable_id) not in existing_parent_ids:
             orphaned_count += 1
-            print(f"  [ORPHAN FOUND] Assignment ID: {assignment_id}")
-            print(f"    Type: {assignable_type}, Referenced ID: {assignable_id} (Not found in {parent_collection_name})")
+            print(f"  [ORPHAN FOUND] Assignment ID: {assignment_doc.id}")
+            print(f"    Type: {assignable_type}, Referenced ID: {assignable_id} (Not found in {PARENT_COLLECTIONS[assignable_type]})")
             print(f"    User ID: {assignment_data.get('userId', 'N/A')}")
             if not dry_run:
                 orphans_to_delete_refs.append(assignment_doc.reference)
-        else:
-            # Optional: print found relations for verbosity
-            # print(f"  [OK] Assignment {assignment_id} for {assignable_type} {assignable_id} is valid.")
-            pass
 
 
     if not dry_run and orphans_to_delete_refs:
@@ -113,7 +140,7 @@ def cleanup_orphan_assignments(db: firestore.Client, dry_run: bool = True):
                 print(f"  Processing batch {i // MAX_BATCH_SIZE + 1} of {len(chunk)} deletions...")
                 for ref_to_delete in chunk:
                     batch.delete(ref_to_delete)
-                batch.commit()
+                await batch.commit()
                 deleted_count += len(chunk)
             print(f"Successfully deleted {deleted_count} orphaned assignments.")
         else:
@@ -152,4 +179,4 @@ if __name__ == "__main__":
         perform_dry_run = False
 
     db_client = initialize_firestore_client()
-    cleanup_orphan_assignments(db_client, dry_run=perform_dry_run)
+    asyncio.run(cleanup_orphan_assignments(db_client, dry_run=perform_dry_run))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+from google.cloud import firestore
+import firebase_admin
+from firebase_admin import credentials, initialize_app
+from dotenv import load_dotenv
+
+# Ensure the script can find modules in the 'backend' directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Load environment variables from .env file located in the parent directory (backend/.env)
+dotenv_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.env'))
+load_dotenv(dotenv_path=dotenv_path)
+
+TRUSTED_DEVICES_COLLECTION = "trustedDevices"
+
+def initialize_firestore_client():
+    """Initializes and returns a Firestore client."""
+    try:
+        project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
+        if not project_id:
+            raise ValueError("GOOGLE_CLOUD_PROJECT environment variable not set.")
+
+        if not firebase_admin._apps:
+            try:
+                cred = credentials.ApplicationDefault()
+                initialize_app(cred, {'projectId': project_id})
+                print(f"Firebase Admin SDK initialized for project: {project_id} using ADC.")
+            except Exception as e_adc:
+                print(f"Failed to initialize Firebase with ADC: {e_adc}. Checking for service account key...")
+                if os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
+                    initialize_app(options={'projectId': project_id})
+                    print(f"Firebase Admin SDK initialized for project: {project_id} using GOOGLE_APPLICATION_CREDENTIALS.")
+                else:
+                    raise ValueError(f"Firebase ADC failed and GOOGLE_APPLICATION_CREDENTIALS not set. Error: {e_adc}")
+        else:
+            print(f"Firebase Admin SDK already initialized for project: {firebase_admin.get_app().project_id}.")
+
+        db = firestore.AsyncClient(project=project_id)
+        print("Firestore client initialized successfully.")
+        return db
+    except ValueError as ve:
+        print(f"Configuration error: {ve}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error initializing Firestore: {e}", file=sys.stderr)
+        sys.exit(1)
+
+async def cleanup_trusted_devices(db: firestore.AsyncClient, dry_run: bool = True):
+    """
+    Finds and optionally deletes expired trusted-device documents.
+
+    The 2FA read paths (check_device_trust / get_user_trusted_devices) filter
+    expiry server-side and never touch stale documents, so without this job
+    expired devices would accumulate forever. Deleting them is safe: a device
+    past expires_at can no longer satisfy any trust check, and trusting the
+    device again simply creates a fresh document.
+    """
+    print(f"Starting trusted device cleanup. DRY RUN: {dry_run}")
+
+    now = datetime.now(timezone.utc)
+
+    # Only the fields printed below are projected; the device_token and
+    # user_agent payloads never leave the server.
+    stale_query = db.collection(TRUSTED_DEVICES_COLLECTION)\
+        .where("expires_at", "<", now)\
+        .select(["user_id", "device_name", "expires_at", "is_active"])
+
+    stale_count = 0
+    deleted_count = 0
+    stale_refs = []
+
+    async for device_doc in stale_query.stream():
+        device_data = device_doc.to_dict()
+        stale_count += 1
+        print(f"  [EXPIRED] Device ID: {device_doc.id}")
+        print(f"    User ID: {device_data.get('user_id', 'N/A')}, Name: {device_data.get('device_name', 'N/A')}")
+        print(f"    Expired at: {device_data.get('expires_at', 'N/A')}, is_active: {device_data.get('is_active', 'N/A')}")
+        if not dry_run:
+            stale_refs.append(device_doc.reference)
+
+    if not dry_run and stale_refs:
+        print(f"\nFound {len(stale_refs)} expired trusted devices to delete.")
+        confirm = input("Proceed with deletion? (yes/no): ")
+        if confirm.lower() == 'yes':
+            # Firestore batch writes are limited (e.g. 500 operations), so
+            # deletions are chunked.
+            MAX_BATCH_SIZE = 400  # Keep it under 500 to be safe
+            for i in range(0, len(stale_refs), MAX_BATCH_SIZE):
+                batch = db.batch()
+                chunk = stale_refs[i:i + MAX_BATCH_SIZE]
+                print(f"  Processing batch {i // MAX_BATCH_SIZE + 1} of {len(chunk)} deletions...")
+                for ref_to_delete in chunk:
+                    batch.delete(ref_to_delete)
+                await batch.commit()
+                deleted_count += len(chunk)
+            print(f"Successfully deleted {deleted_count} expired trusted devices.")
+        else:
+            print("Deletion cancelled by user.")
+    elif dry_run:
+        print(f"\nDry run complete. Found {stale_count} expired trusted devices.")
+        if stale_count > 0:
+            print("Run with --execute to delete them.")
+    else:  # Not dry_run but nothing stale found
+        print("\nNo expired trusted devices found to delete.")
+
+    print(f"\nSummary: Found {stale_count} expired trusted devices. Deleted: {deleted_count if not dry_run else 0}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cleanup expired trusted devices in Firestore.")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List expired trusted devices without deleting them. (Default behavior)"
+    )
+    parser.add_argument(
+        "--execute",
+        action="store_true",
+        help="Actually delete the expired trusted devices found. Requires confirmation."
+    )
+
+    args = parser.parse_args()
+
+    if args.execute and args.dry_run:
+        print("Error: Cannot use --execute and --dry-run simultaneously.", file=sys.stderr)
+        sys.exit(1)
+
+    perform_dry_run = True
+    if args.execute:
+        perform_dry_run = False
+
+    db_client = initialize_firestore_client()
+    asyncio.run(cleanup_trusted_devices(db_client, dry_run=perform_dry_run))
@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 
 import argparse
-import firebase_admin
-from firebase_admin import credentials, auth, firestore
 import secrets
 import os
 import sys
 
+# firebase_admin and its submodules are imported lazily inside the functions
+# that need them, so --help and argument errors don't pay the SDK import cost.
+
 # --- Configuration ---
 DEFAULT_PROJECT_ID = "fijian"
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT", DEFAULT_PROJECT_ID)
@@ -19,6 +20,9 @@ def generate_password(length=14):
 
 def initialize_firebase_admin():
     """Initializes the Firebase Admin SDK if not already initialized."""
+    import firebase_admin
+    from firebase_admin import credentials
+
     if not firebase_admin._apps:
         try:
             print(f"Initializing Firebase Admin SDK for project: {PROJECT_ID}...")
@@ -34,13 +38,26 @@ def initialize_firebase_admin():
                   "and the GOOGLE_CLOUD_PROJECT environment variable is set correctly if not 'fijian'.", file=sys.stderr)
             sys.exit(1)
 
+_db = None
+
+def get_firestore_client():
+    """Returns a module-cached Firestore client so repeated calls (e.g. bulk
+    seeding loops) reuse one gRPC channel instead of rebuilding it."""
+    global _db
+    if _db is None:
+        from firebase_admin import firestore
+        initialize_firebase_admin()
+        _db = firestore.client()
+    return _db
+
 def create_admin_user(email, first_name, last_name):
     """
     Creates a new user in Firebase Authentication and a corresponding user
     document in Firestore with the sysadmin role.
     """
-    initialize_firebase_admin()
-    db = firestore.client()
+    from firebase_admin import auth, firestore
+
+    db = get_firestore_client()
     password = generate_password()
     created_auth_user_uid = None  # To keep track for potential cleanup
 
@@ -99,15 +116,84 @@ def create_admin_user(email, first_name, last_name):
         print("-" * 70)
 
 
+def create_admin_users_from_csv(csv_path):
+    """
+    Bulk-creates sysadmin users from a CSV of email,firstName,lastName rows.
+
+    Auth users must be created one by one (the Admin SDK has no batch
+    create), but all Firestore documents are written through shared
+    WriteBatches of up to 500 sets, and the cached client/auth handles are
+    reused across the loop.
+    """
+    import csv
+
+    from firebase_admin import auth, firestore
+
+    db = get_firestore_client()
+    batch = db.batch()
+    batched_count = 0
+
+    with open(csv_path, newline="") as csv_file:
+        for row in csv.reader(csv_file):
+            if not row or row[0].startswith("#"):
+                continue
+            try:
+                email, first_name, last_name = (field.strip() for field in row)
+            except ValueError:
+                print(f"Skipping malformed row (expected email,firstName,lastName): {row}", file=sys.stderr)
+                continue
+
+            password = generate_password()
+            try:
+                firebase_user = auth.create_user(
+                    email=email,
+                    email_verified=True,
+                    password=password,
+                    display_name=f"{first_name} {last_name}",
+                    disabled=False,
+                )
+            except auth.EmailAlreadyExistsError:
+                print(f"Skipping '{email}': Firebase Auth user already exists.", file=sys.stderr)
+                continue
+
+            print(f"Created Firebase Auth user {firebase_user.uid} for {email}; PASSWORD: {password}")
+            batch.set(
+                db.collection(USERS_COLLECTION).document(firebase_user.uid),
+                {
+                    "email": email.lower(),
+                    "firstName": first_name,
+                    "lastName": last_name,
+                    "displayName": f"{first_name} {last_name}",
+                    "assignedRoleIds": [SYSADMIN_ROLE_ID],
+                    "status": "active",
+                    "createdAt": firestore.SERVER_TIMESTAMP,
+                    "updatedAt": firestore.SERVER_TIMESTAMP,
+                },
+            )
+            batched_count += 1
+            if batched_count == 500:  # Firestore's per-batch write limit
+                batch.commit()
+                batch = db.batch()
+                batched_count = 0
+
+    if batched_count:
+        batch.commit()
+    print("\nBulk sysadmin user creation complete.")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Create a new system administrator user in Firebase and Firestore."
     )
-    parser.add_argument("email", type=str, help="Email address for the new sysadmin user.")
-    parser.add_argument("firstName", type=str, help="First name of the sysadmin user.")
-    parser.add_argument("lastName", type=str, help="Last name of the sysadmin user.")
+    parser.add_argument("email", type=str, nargs="?", help="Email address for the new sysadmin user.")
+    parser.add_argument("firstName", type=str, nargs="?", help="First name of the sysadmin user.")
+    parser.add_argument("lastName", type=str, nargs="?", help="Last name of the sysadmin user.")
+    parser.add_argument("--csv", type=str, help="Bulk mode: CSV file of email,firstName,lastName rows.")
     args = parser.parse_args()
 
+    if not args.csv and not (args.email and args.firstName and args.lastName):
+        parser.error("provide email, firstName and lastName, or --csv FILE")
+
     print("=" * 70)
     print("Starting Sysadmin User Creation Script")
     print("-" * 70)
@@ -115,8 +201,11 @@ def main():
     if PROJECT_ID == DEFAULT_PROJECT_ID and "GOOGLE_CLOUD_PROJECT" not in os.environ:
         print(f"Note: Using default PROJECT_ID '{DEFAULT_PROJECT_ID}'. "
               "Set GOOGLE_CLOUD_PROJECT environment variable to override if necessary.")
-    
-    create_admin_user(args.email, args.firstName, args.lastName)
+
+    if args.csv:
+        create_admin_users_from_csv(args.csv)
+    else:
+        create_admin_user(args.email, args.firstName, args.lastName)
 
 if __name__ == "__main__":
     main()
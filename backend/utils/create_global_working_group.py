@@ -86,7 +86,9 @@ async def get_all_users(db: firestore.AsyncClient):
     """Get all active users from the database"""
     print("🔍 Fetching all users...")
     
-    users_query = db.collection(USERS_COLLECTION)
+    # Only the name/email fields are consumed below (for the per-user log
+    # lines); the field mask keeps the rest of each profile off the wire
+    users_query = db.collection(USERS_COLLECTION).select(["firstName", "lastName", "email"])
     users_docs = users_query.stream()
     
     users = []
@@ -108,27 +110,30 @@ async def assign_users_to_global_wg(db: firestore.AsyncClient, global_wg_id: str
     
     assigned_count = 0
     skipped_count = 0
-    
+
+    # One query for the group's existing assignments instead of one per user:
+    # membership checks then happen against an in-memory set
+    existing_assignment_query = db.collection(ASSIGNMENTS_COLLECTION)\
+        .where("assignableId", "==", global_wg_id)\
+        .where("assignableType", "==", "workingGroup")
+
+    already_assigned_user_ids = set()
+    async for assignment_doc in existing_assignment_query.stream():
+        already_assigned_user_ids.add(assignment_doc.to_dict().get("userId"))
+
+    # New assignments are grouped into WriteBatches (document() allocates IDs
+    # client-side, so only the commits hit the network)
+    MAX_BATCH_SIZE = 400  # Keep it under Firestore's 500-op limit to be safe
+    batch = db.batch()
+    batched_count = 0
+
     for user in users:
         user_id = user["id"]
-        
-        # Check if user is already assigned to the global working group
-        existing_assignment_query = db.collection(ASSIGNMENTS_COLLECTION)\
-            .where("userId", "==", user_id)\
-            .where("assignableId", "==", global_wg_id)\
-            .where("assignableType", "==", "workingGroup")
-        
-        existing_assignments = existing_assignment_query.stream()
-        assignment_exists = False
-        
-        async for assignment_doc in existing_assignments:
-            assignment_exists = True
-            break
-        
-        if assignment_exists:
+
+        if user_id in already_assigned_user_ids:
             skipped_count += 1
             continue
-        
+
         # Create assignment
         assignment_data = {
             "userId": user_id,
@@ -142,14 +147,21 @@ async def assign_users_to_global_wg(db: firestore.AsyncClient, global_wg_id: str
             "createdAt": firestore.SERVER_TIMESTAMP,
             "updatedAt": firestore.SERVER_TIMESTAMP
         }
-        
-        assignment_ref = db.collection(ASSIGNMENTS_COLLECTION).document()
-        await assignment_ref.set(assignment_data)
-        
+
+        batch.set(db.collection(ASSIGNMENTS_COLLECTION).document(), assignment_data)
+        batched_count += 1
+        if batched_count == MAX_BATCH_SIZE:
+            await batch.commit()
+            batch = db.batch()
+            batched_count = 0
+
         assigned_count += 1
         user_name = f"{user.get('firstName', '')} {user.get('lastName', '')}".strip() or user.get('email', user_id)
         print(f"  ✅ Assigned {user_name} to global working group")
-    
+
+    if batched_count:
+        await batch.commit()
+
     print(f"✅ Assignment complete: {assigned_count} new assignments, {skipped_count} already assigned")
 
 async def update_auth_permissions(db: firestore.AsyncClient):